@@ -0,0 +1,315 @@
+import copy
+import csv
+import io
+import os
+import sys
+import pandas as pd
+import seaborn as sns
+import numpy as np
+import frame_cache
+from density import DensityScatter
+from cube import AggregateCube, QUANTILES
+from regression import PriceModel
+from streaming import StreamingStats, should_stream
+from config import CAT_ORDERS, PLOTS, COUNT_PLOTS, STAT_COLUMNS, PLOT_SIZE, COUNT_PLOTS_SIZE, MODEL_PLOT_SIZE
+
+# --- Constants & Configuration ---
+CHUNK_ROWS = 100_000 # Rows parsed between progress updates / cancellation checks
+# Compact dtypes read straight from the CSV; the quoted index column is never parsed.
+# Price is float32 (exact up to $16.7M) so an empty cell reads as NaN instead of failing the load.
+COLUMN_DTYPES = {
+    'carat': 'float32', 'depth': 'float32', 'table': 'float32', 'price': 'float32',
+    'x': 'float32', 'y': 'float32', 'z': 'float32',
+    **{col: pd.CategoricalDtype(order, ordered=True) for col, order in CAT_ORDERS.items()}
+}
+RESIDUAL_BINS = 60
+
+# --- Data Core ---
+
+def _clean(chunk):
+    """Drops zero-dimension rows (categories are already applied by COLUMN_DTYPES)."""
+    return chunk[(chunk[['x', 'y', 'z']] != 0).all(axis=1)]
+
+def memory_footprint(frame):
+    """Returns (default_bytes, compact_bytes): the frame as read_csv's default dtypes would hold it vs. now.
+
+    The default estimate counts 8 bytes per numeric value and per object
+    pointer, plus one Python string per categorical value, like memory_usage(deep=True).
+    """
+    rows = len(frame)
+    default = frame.index.memory_usage()
+    for col in frame.columns:
+        default += 8 * rows
+        if isinstance(frame[col].dtype, pd.CategoricalDtype):
+            counts = frame[col].value_counts()
+            default += sum(n * sys.getsizeof(str(cat)) for cat, n in counts.items())
+    return int(default), int(frame.memory_usage(deep=True).sum())
+
+class LoadCancelled(Exception):
+    """Raised inside a chunked read once `cancelled()` turns true."""
+
+class _CompleteLines(io.RawIOBase):
+    """Reads an open binary file only up to `end`, the end of its last complete line."""
+
+    def __init__(self, f, end):
+        self.f, self.end = f, end
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self.f.readinto(memoryview(buffer)[:max(self.end - self.f.tell(), 0)])
+
+    def tell(self):
+        return self.f.tell()
+
+def _last_line_end(f, start):
+    """Offset just past the file's last newline, or `start` if none follows it."""
+    pos = f.seek(0, os.SEEK_END)
+    while pos > start:
+        block = max(pos - frame_cache.ANCHOR_BYTES, start)
+        f.seek(block)
+        cut = f.read(pos - block).rfind(b'\n')
+        if cut >= 0:
+            return block + cut + 1
+        pos = block
+    return start
+
+def iter_chunks(path, progress=None, cancelled=None, extent=None):
+    """Yields (raw_rows, cleaned_chunk) for every CHUNK_ROWS block of the CSV.
+
+    Only complete lines are parsed: a last line still being written is left
+    for a later append_dataset. `progress(rows, percent)` is called after
+    every chunk with the bytes-read percentage. An `extent` dict is filled
+    with the header columns and the byte offset parsing stopped at (plus its
+    tail_anchor); if it already holds an offset, only the lines appended
+    after it are parsed.
+    """
+    size = max(os.path.getsize(path), 1)
+    rows = 0
+    with open(path, 'rb') as f:
+        if extent and extent.get('offset'):
+            start, columns = extent['offset'], extent['columns']
+        else:
+            columns = next(csv.reader([f.readline().decode('utf-8-sig')]))
+            start = f.tell()
+        end = _last_line_end(f, start)
+        f.seek(start)
+        source = _CompleteLines(f, end)
+
+        if end > start:
+            for chunk in pd.read_csv(source, header=None, names=columns, usecols=list(COLUMN_DTYPES),
+                                     dtype=COLUMN_DTYPES, chunksize=CHUNK_ROWS):
+                if cancelled and cancelled():
+                    raise LoadCancelled()
+                rows += len(chunk)
+                yield len(chunk), _clean(chunk)
+                if progress:
+                    progress(rows, 100 * source.tell() / size)
+
+        if extent is not None:
+            extent.update(columns=columns, offset=end)
+            extent['anchor'] = frame_cache.tail_anchor(path, end)
+
+def read_frame(path, progress=None, cancelled=None):
+    """Reads the cleaned dataset chunk by chunk.
+
+    Returns (frame, initial_rows, source, extent); raises LoadCancelled if
+    `cancelled()` turned true mid-read. `extent` marks where the read
+    stopped and carries the cache signature, so append_dataset can pick up from there.
+    """
+    cached = frame_cache.load(path, CAT_ORDERS)
+    if cached is not None:
+        frame, meta = cached
+        extent = meta.get('extent')
+        return frame, meta['initial_rows'], "cache", dict(extent, signature=meta['signature']) if extent else None
+
+    signature = frame_cache.source_signature(path, CAT_ORDERS)
+    chunks, initial_rows, extent = [], 0, {}
+    for raw_rows, chunk in iter_chunks(path, progress, cancelled, extent):
+        initial_rows += raw_rows
+        chunks.append(chunk)
+    frame = pd.concat(chunks)
+
+    try:
+        frame_cache.save(path, frame, signature, initial_rows=initial_rows, extent=extent)
+    except OSError as e:
+        print(f"Could not write frame cache: {e}")
+    return frame, initial_rows, "CSV", dict(extent, signature=signature)
+
+def stream_dataset(path, progress=None, cancelled=None):
+    """Summarizes the CSV chunk by chunk without ever holding the full frame.
+
+    Returns (None, cube, initial_rows, source); the cube carries sketch
+    quantiles and histograms for the COUNT_PLOTS 'hist' panels.
+    """
+    summary = StreamingStats(CAT_ORDERS, [item['col'] for item in COUNT_PLOTS if item['plot_type'] == 'hist'])
+    initial_rows = 0
+    for raw_rows, chunk in iter_chunks(path, progress, cancelled):
+        initial_rows += raw_rows
+        summary.add(chunk)
+    return None, summary.finish(), initial_rows, "stream"
+
+def load_dataset(path, progress=None, cancelled=None):
+    """Reads the frame and builds its aggregate cube, streaming files too large for memory.
+
+    Returns (frame, cube, initial_rows, source), or None if cancelled. The
+    frame is None for streamed loads; only cube-backed views are available.
+    """
+    try:
+        if should_stream(path):
+            return stream_dataset(path, progress, cancelled)
+        frame, initial_rows, source, extent = read_frame(path, progress, cancelled)
+    except LoadCancelled:
+        return None
+    cube = AggregateCube.build(frame, CAT_ORDERS)
+    cube.extent = dict(extent, path=path, initial_rows=initial_rows) if extent else None
+    cube.model = PriceModel.build(frame, CAT_ORDERS)
+    return frame, cube, initial_rows, source
+
+def _still_appended(path, extent):
+    """True if `path` is the extent's file and its loaded region is unchanged."""
+    if extent is None or extent['path'] != path or os.path.getsize(path) < extent['offset']:
+        return False
+    return frame_cache.tail_anchor(path, extent['offset']) == extent['anchor']
+
+def append_dataset(path, frame, cube, progress=None, cancelled=None):
+    """Parses only the rows appended to `path` since `frame`/`cube` were loaded.
+
+    New rows go through the same dtypes and zero-dimension filter, are
+    appended to a new frame and added to a copy of the cube (the inputs stay
+    untouched for the GUI thread). Falls back to load_dataset when there is
+    nothing to append to or the loaded region of the file was rewritten.
+    Returns (frame, cube, initial_rows, source), or None if cancelled.
+    """
+    extent = getattr(cube, 'extent', None)
+    if frame is None or not _still_appended(path, extent):
+        return load_dataset(path, progress, cancelled)
+
+    extent = dict(extent)
+    chunks, added_rows = [], 0
+    try:
+        for raw_rows, chunk in iter_chunks(path, progress, cancelled, extent):
+            added_rows += raw_rows
+            chunks.append(chunk)
+    except LoadCancelled:
+        return None
+    if not added_rows:
+        return frame, cube, extent['initial_rows'], "unchanged file"
+
+    tail = pd.concat(chunks)
+    tail.index += extent['initial_rows']
+    frame = pd.concat([frame, tail])
+    cube = copy.deepcopy(cube)
+    cube.add_arrays({dim: tail[dim].cat.codes.to_numpy() for dim in cube.dims},
+                    {m: tail[m].to_numpy() for m in cube.measures})
+    cube.quantiles = {m: frame[m].quantile(QUANTILES).to_numpy() for m in cube.measures}
+    if cube.model is not None:
+        cube.model.add_frame(tail) # Only the new rows enter the normal equations
+        cube.model.fit()
+    extent['initial_rows'] += added_rows
+
+    try:
+        # Chained onto the loaded signature, so only the appended bytes are hashed and only the new rows written
+        base = extent['signature']
+        extent['signature'] = frame_cache.appended_signature(path, base)
+        extra = {key: value for key, value in extent.items() if key not in ('path', 'initial_rows', 'signature')}
+        if not frame_cache.append(path, tail, base, extent['signature'], initial_rows=extent['initial_rows'], extent=extra):
+            frame_cache.save(path, frame, extent['signature'], initial_rows=extent['initial_rows'], extent=extra)
+    except OSError as e:
+        print(f"Could not write frame cache: {e}")
+    cube.extent = extent
+    return frame, cube, extent['initial_rows'], f"appended rows (+{added_rows:,})"
+
+# --- Plot Drawing ---
+
+def draw_plot(fig, config, df, cube):
+    """Draws one PLOTS entry onto an empty figure."""
+    ax = fig.subplots()
+
+    if config['type'] == 'scatter' and len(df) > config['density_threshold']:
+        hue = df[config['hue']]
+        fig.density = DensityScatter(ax, df[config['x']].to_numpy(), df[config['y']].to_numpy(), hue.cat.codes.to_numpy(),
+                                     hue.cat.categories, sns.color_palette(n_colors=len(hue.cat.categories)),
+                                     title=config['hue'])
+        ax.set(xlabel=f"{config['x'].capitalize()} Weight", ylabel=f"{config['y'].capitalize()} ($)")
+    elif config['type'] == 'scatter':
+        sns.scatterplot(x=config['x'], y=config['y'], hue=config['hue'], data=df, ax=ax, alpha=0.6, s=10)
+        ax.set(xlabel=f"{config['x'].capitalize()} Weight", ylabel=f"{config['y'].capitalize()} ($)")
+    elif config['type'] == 'bar':
+        stats = cube.marginal(config['x'], config['y']).loc[config['order']]
+        ci95 = 1.96 * stats['std'] / np.sqrt(stats['count'])
+        ax.bar(stats.index, stats['mean'], yerr=ci95, capsize=3, color=sns.color_palette('viridis', len(stats)))
+        ax.set(xlabel=f"{config['x'].capitalize()} Quality", ylabel=f"Average {config['y'].capitalize()} ($)")
+
+    ax.set_title(config['title'])
+    fig.tight_layout()
+
+def draw_count_plots(fig, df, cube):
+    """Draws the four COUNT_PLOTS panels onto an empty figure."""
+    axes = fig.subplots(2, 2).flatten()
+
+    for ax, item in zip(axes, COUNT_PLOTS):
+        if item['plot_type'] == 'count':
+            counts = cube.counts(item['col']).loc[item['order']]
+            ax.bar(counts.index, counts, color=sns.color_palette('Blues_d', len(counts)))
+            ax.set_xlabel(f"{item['col'].capitalize()} Grade")
+        elif df is None: # 'hist' for depth, from a streamed histogram
+            counts, edges = cube.histograms[item['col']]
+            ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', color='skyblue', edgecolor='black', linewidth=0.5)
+            ax.set_xlabel("Depth Percentage")
+        else: # 'hist' for depth
+            sns.histplot(x=item['col'], data=df, ax=ax, bins=25, kde=False, color='skyblue')
+            ax.set_xlabel("Depth Percentage")
+
+        ax.set_ylabel("Count of Diamonds")
+        ax.set_title(item['title'], fontsize=10)
+
+    fig.tight_layout(pad=3.0)
+
+def draw_price_model(fig, model, df):
+    """Draws the fitted grade premiums and, when rows are available, the residual distribution."""
+    coef_ax, resid_ax = fig.subplots(1, 2, gridspec_kw={'width_ratios': [3, 2]})
+    coefs = model.coefficients()
+
+    grades = coefs.drop(['intercept', 'log_carat'])
+    premium = (grades['multiplier'] - 1) * 100
+    colors = [sns.color_palette('viridis', len(CAT_ORDERS))[list(CAT_ORDERS).index(term.split('=')[0])]
+              for term in grades.index]
+    coef_ax.barh(grades.index, premium, color=colors)
+    coef_ax.invert_yaxis()
+    coef_ax.tick_params(axis='y', labelsize=7)
+    coef_ax.set_xlabel("Price premium vs. lowest grade (%)")
+    coef_ax.set_title(f"price ∝ carat^{coefs.loc['log_carat', 'coef']:.2f}  (R² {model.r_squared():.3f}, n={model.n:,})",
+                      fontsize=10)
+
+    if df is not None and len(df):
+        residuals = model.residuals(df)
+        residuals = residuals[np.isfinite(residuals)]
+        resid_ax.hist(residuals, bins=RESIDUAL_BINS, color='skyblue', edgecolor='black', linewidth=0.5)
+        resid_ax.set_title(f"Residuals of log(price)  (RMSE {np.sqrt(np.mean(residuals ** 2)):.3f})", fontsize=10)
+    else:
+        resid_ax.text(0.5, 0.5, f"Residual std. dev.\n{np.sqrt(model.sigma2):.3f} (log price)",
+                      ha='center', va='center', transform=resid_ax.transAxes)
+        resid_ax.set_title("Residuals (streamed: no rows kept)", fontsize=10)
+    resid_ax.set_xlabel("log(actual / predicted)")
+    fig.tight_layout()
+
+def draw_comparison(fig, cubes, names, measure='price'):
+    """Draws mean `measure` by cut, color and clarity with one bar per dataset in each grade group."""
+    axes = fig.subplots(len(CAT_ORDERS), 1)
+    colors = sns.color_palette(n_colors=len(cubes))
+    width = 0.8 / len(cubes)
+
+    for ax, (dim, order) in zip(axes, CAT_ORDERS.items()):
+        x = np.arange(len(order))
+        for i, (cube, name) in enumerate(zip(cubes, names)):
+            stats = cube.marginal(dim, measure).loc[order]
+            ci95 = 1.96 * stats['std'] / np.sqrt(stats['count'])
+            ax.bar(x + (i - (len(cubes) - 1) / 2) * width, stats['mean'], width, yerr=ci95, capsize=2,
+                   color=colors[i], label=name)
+        ax.set_xticks(x, order)
+        ax.set(xlabel=f"{dim.capitalize()} Grade", ylabel=f"Average {measure.capitalize()}")
+        ax.set_title(f"Average {measure.capitalize()} by {dim.capitalize()}", fontsize=10)
+    axes[0].legend(fontsize=8)
+    fig.tight_layout()
@@ -0,0 +1,199 @@
+"""Benchmark suite for the analyzer's data and plotting paths on synthetic diamond CSVs.
+
+Usage: python bench.py --rows 10k 100k 1m 10m -o bench.json [--compare baseline.json]
+
+Each size runs in a fresh process so its peak RSS is its own.
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError: # Windows: peak RSS is not reported
+    resource = None
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import frame_cache
+from analysis import (CAT_ORDERS, COLUMN_DTYPES, PLOTS, PLOT_SIZE, COUNT_PLOTS_SIZE, STAT_COLUMNS,
+                      _clean, load_dataset, draw_plot, draw_count_plots)
+from cube import AggregateCube
+
+# --- Benchmark Configuration ---
+DATA_DIR = "bench_data"
+DEFAULT_ROWS = ['10k', '100k', '1m', '10m']
+GEN_CHUNK = 1_000_000
+REPEATS = 3
+SEED = 42
+# Category mix of the shipped diamonds.csv, in CAT_ORDERS order
+CAT_WEIGHTS = {
+    'cut': [0.03, 0.09, 0.22, 0.26, 0.40],
+    'color': [0.05, 0.10, 0.15, 0.21, 0.18, 0.18, 0.13],
+    'clarity': [0.01, 0.17, 0.24, 0.23, 0.15, 0.09, 0.07, 0.04],
+}
+ZERO_DIM_RATE = 0.0004   # Share of rows with a zero x/y/z, so cleaning has something to drop
+
+# --- Synthetic Data ---
+
+def parse_rows(text):
+    """'10k' / '1m' / '250000' -> int."""
+    text = text.lower().replace('_', '')
+    scale = {'k': 1_000, 'm': 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip('km')) * scale)
+
+def _synthetic_chunk(rng, start, rows):
+    carat = np.clip(rng.lognormal(-0.45, 0.58, rows), 0.2, 5.0).round(2)
+    cats = {col: rng.choice(CAT_ORDERS[col], rows, p=CAT_WEIGHTS[col]) for col in CAT_ORDERS}
+    grade = sum(pd.Categorical(cats[col], CAT_ORDERS[col]).codes / len(CAT_ORDERS[col]) for col in CAT_ORDERS)
+    price = np.clip(3900 * carat ** 1.7 * (0.7 + 0.25 * grade) * rng.lognormal(0, 0.15, rows), 326, 18823).astype(int)
+    x = (6.45 * carat ** (1 / 3) * rng.normal(1, 0.01, rows)).round(2)
+    y = (x * rng.normal(1, 0.005, rows)).round(2)
+    depth = rng.normal(61.75, 1.43, rows).round(1)
+    z = (x * depth / 100).round(2)
+    z[rng.random(rows) < ZERO_DIM_RATE] = 0
+    return pd.DataFrame({
+        '': np.arange(start + 1, start + rows + 1).astype(str), 'carat': carat,
+        'cut': cats['cut'], 'color': cats['color'], 'clarity': cats['clarity'], 'depth': depth,
+        'table': rng.normal(57.46, 2.23, rows).round(0), 'price': price, 'x': x, 'y': y, 'z': z,
+    })
+
+def make_dataset(rows, directory=DATA_DIR, seed=SEED):
+    """Writes (once) a diamonds.csv-shaped file with `rows` rows and returns its path."""
+    path = os.path.join(directory, f"diamonds_{rows}_{seed}.csv")
+    if os.path.exists(path):
+        return path
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    with open(path + '.tmp', 'w', newline='') as f:
+        for start in range(0, rows, GEN_CHUNK):
+            chunk = _synthetic_chunk(rng, start, min(GEN_CHUNK, rows - start))
+            chunk.to_csv(f, index=False, header=start == 0, quoting=csv.QUOTE_NONNUMERIC)
+    os.replace(path + '.tmp', path)
+    return path
+
+# --- Timed Stages ---
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 1024**2 if sys.platform == 'darwin' else peak / 1024, 1) # bytes on macOS, KiB elsewhere
+
+def _timed(results, name, fn, repeats):
+    """Runs `fn` `repeats` times, stores min/median seconds and the peak RSS so far; returns its last value."""
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        value = fn()
+        times.append(time.perf_counter() - start)
+    results[name] = {'min_s': min(times), 'median_s': statistics.median(times), 'peak_rss_mb': _peak_rss_mb()}
+    return value
+
+def _render(draw, size):
+    """Draws onto a fresh Agg figure and rasterizes it, like the GUI canvas would."""
+    fig = Figure(figsize=size, dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    draw(fig)
+    canvas.draw()
+
+def run_size(rows, repeats=REPEATS, data_dir=DATA_DIR):
+    """Benchmarks every stage on one synthetic file; runs inside its own worker process."""
+    path = make_dataset(rows, data_dir)
+    usecols = list(COLUMN_DTYPES)
+    numeric = {col: dtype for col, dtype in COLUMN_DTYPES.items() if col not in CAT_ORDERS}
+    stages = {}
+    result = {'rows': rows, 'csv_bytes': os.path.getsize(path), 'baseline_rss_mb': _peak_rss_mb(), 'stages': stages}
+
+    # The app parses and categorizes in one read_csv call; they are split here to see each cost
+    raw = _timed(stages, 'parse', lambda: pd.read_csv(path, usecols=usecols, dtype=numeric), repeats)
+    categorized = _timed(stages, 'categorize', lambda: raw.astype(
+        {col: COLUMN_DTYPES[col] for col in CAT_ORDERS}), repeats)
+    del raw
+    df = _timed(stages, 'clean', lambda: _clean(categorized), repeats)
+    del categorized
+    cube = _timed(stages, 'cube', lambda: AggregateCube.build(df, CAT_ORDERS), repeats)
+    _timed(stages, 'describe', lambda: cube.describe(STAT_COLUMNS), repeats)
+
+    # End to end, as the GUI's loader sees it: cold CSV read, then the warm frame cache
+    def cold_load():
+        frame_cache.invalidate(path)
+        return load_dataset(path)
+    result['source'] = _timed(stages, 'load_cold', cold_load, 1)[3]
+    _timed(stages, 'load_warm', lambda: load_dataset(path), repeats)
+
+    for name, config in PLOTS.items():
+        _timed(stages, f'plot_{name}', lambda: _render(lambda fig: draw_plot(fig, config, df, cube), PLOT_SIZE), repeats)
+    _timed(stages, 'plot_count_plots', lambda: _render(lambda fig: draw_count_plots(fig, df, cube), COUNT_PLOTS_SIZE),
+           repeats)
+    result['peak_rss_mb'] = _peak_rss_mb()
+    return result
+
+# --- Suite ---
+
+def _environment(repeats):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+            'numpy': np.__version__, 'pandas': pd.__version__, 'matplotlib': matplotlib.__version__,
+            'commit': commit or None, 'seed': SEED, 'repeats': repeats, 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+def compare(current, baseline):
+    """Prints median-time ratios (current / baseline) for every stage both runs measured."""
+    before = {r['rows']: r['stages'] for r in baseline['results']}
+    for result in current['results']:
+        old = before.get(result['rows'])
+        if old is None:
+            continue
+        print(f"\n{result['rows']:,} rows  (current / baseline median)")
+        for stage, timing in result['stages'].items():
+            if stage in old:
+                ratio = timing['median_s'] / max(old[stage]['median_s'], 1e-9)
+                print(f"  {stage:<18} {old[stage]['median_s']:9.4f}s -> {timing['median_s']:9.4f}s  x{ratio:.2f}")
+
+def run(sizes, out, repeats=REPEATS, data_dir=DATA_DIR):
+    """Benchmarks each size in a fresh process and writes the suite's JSON."""
+    suite = {'environment': _environment(repeats), 'results': []}
+    for rows in sizes:
+        print(f"Benchmarking {rows:,} rows...")
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            result = pool.submit(run_size, rows, repeats, data_dir).result()
+        suite['results'].append(result)
+        for stage, timing in result['stages'].items():
+            print(f"  {stage:<18} {timing['median_s']:9.4f}s")
+        print(f"  peak RSS {result['peak_rss_mb']} MB")
+
+    with open(out, 'w') as f:
+        json.dump(suite, f, indent=2)
+    return suite
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Diamond Price Analyzer on synthetic data.")
+    parser.add_argument('--rows', nargs='+', default=DEFAULT_ROWS, help="dataset sizes, e.g. 10k 1m (default: 10k-10m)")
+    parser.add_argument('-o', '--out', default='bench.json', help="results file (default: bench.json)")
+    parser.add_argument('-r', '--repeats', type=int, default=REPEATS, help="runs per stage; min and median are kept")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="where generated CSVs are kept between runs")
+    parser.add_argument('--compare', help="earlier results file to print speed ratios against")
+    args = parser.parse_args(argv)
+
+    suite = run([parse_rows(r) for r in args.rows], args.out, args.repeats, args.data_dir)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(suite, json.load(f))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""Parallel loading of several diamond CSVs for side-by-side comparison.
+
+Each CSV is loaded and cleaned by load_dataset in its own worker process,
+which copies the columns into one shared memory block; the GUI process maps
+that block and wraps the columns in a DataFrame without copying them.
+"""
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+from analysis import CAT_ORDERS, load_dataset
+
+# --- Constants & Configuration ---
+ALIGN = 64  # Column offsets inside a block start on cache-line boundaries
+
+_published = [] # Worker side: blocks stay open until the pool exits (Windows frees a block with its last handle)
+_retired = []   # GUI side: released blocks whose columns are still referenced somewhere
+
+
+def _publish(path):
+    """Worker: loads one CSV and copies its cleaned columns into a new shared memory block."""
+    frame, cube, initial_rows, source = load_dataset(path)
+    info = {'path': path, 'cube': cube, 'initial_rows': initial_rows, 'source': source,
+            'shm': None, 'rows': 0, 'columns': []}
+    if frame is None: # Streamed: only the summary cube comes back
+        return info
+
+    arrays, size = {}, 0
+    for col in frame.columns:
+        values = frame[col].cat.codes.to_numpy() if col in CAT_ORDERS else frame[col].to_numpy()
+        size = -(-size // ALIGN) * ALIGN
+        info['columns'].append((col, values.dtype.str, size))
+        arrays[col] = values
+        size += values.nbytes
+
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for col, dtype, offset in info['columns']:
+        np.ndarray(len(frame), dtype=dtype, buffer=shm.buf, offset=offset)[:] = arrays[col]
+    if os.name == 'posix':
+        # The GUI process owns the block from here on and unlinks it in release()
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    _published.append(shm)
+    info.update(shm=shm.name, rows=len(frame))
+    return info
+
+
+class SharedDataset:
+    """One compared dataset: its cube, and its frame read in place from the worker's shared memory block."""
+
+    def __init__(self, info):
+        self.path = info['path']
+        self.name = os.path.basename(self.path)
+        self.cube = info['cube']
+        self.initial_rows = info['initial_rows']
+        self.source = info['source']
+        self.frame = None
+        self._shm = shared_memory.SharedMemory(name=info['shm']) if info['shm'] else None
+        if self._shm is not None:
+            self._base_refs = sys.getrefcount(self._shm._mmap) # Before any column views the mapping
+            columns = {}
+            for col, dtype, offset in info['columns']:
+                values = np.ndarray(info['rows'], dtype=dtype, buffer=self._shm.buf, offset=offset)
+                if col in CAT_ORDERS:
+                    values = pd.Categorical.from_codes(values, categories=CAT_ORDERS[col], ordered=True)
+                columns[col] = values
+            self.frame = pd.DataFrame(columns, copy=False)
+
+    def release(self):
+        """Removes the shared block; it is unmapped once nothing views its columns any more."""
+        self.frame = None
+        if self._shm is None:
+            return
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        _retired.append((self._shm, self._base_refs))
+        self._shm = None
+        close_unused()
+
+
+def close_unused():
+    """Unmaps released blocks whose columns are no longer referenced.
+
+    NumPy keeps the mapping itself as each column's base without holding a
+    buffer export, so SharedMemory.close() would not refuse while a column
+    (e.g. a dataset opened in the main window) is alive; the mapping's
+    reference count tells instead.
+    """
+    for entry in list(_retired):
+        shm, base_refs = entry
+        if sys.getrefcount(shm._mmap) <= base_refs:
+            shm.close()
+            _retired.remove(entry)
+
+
+def load_many(paths, workers=None, on_loaded=None):
+    """Loads every CSV in parallel worker processes.
+
+    Returns (datasets in `paths` order, {path: error}) so one bad file does
+    not cancel the others. `on_loaded(path)` is called as each one arrives.
+    """
+    close_unused()
+    paths = list(dict.fromkeys(paths))
+    datasets, errors = {}, {}
+    # Spawned workers: forking the GUI process while its other threads hold locks could hang the child
+    with ProcessPoolExecutor(max_workers=workers or min(len(paths), os.cpu_count() or 1),
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = {pool.submit(_publish, path): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                datasets[path] = SharedDataset(future.result()) # Attached before the pool lets the worker exit
+            except Exception as e:
+                errors[path] = e
+                continue
+            if on_loaded:
+                on_loaded(path)
+    return [datasets[path] for path in paths if path in datasets], errors
@@ -0,0 +1,29 @@
+"""Dataset and plot settings shared by the GUI and the data core.
+
+Kept free of pandas/matplotlib imports so main.py can build its window
+before the heavy modules have loaded.
+"""
+
+# --- Constants & Configuration ---
+CAT_ORDERS = {
+    'cut': ['Fair', 'Good', 'Very Good', 'Premium', 'Ideal'],
+    'color': ['J', 'I', 'H', 'G', 'F', 'E', 'D'],
+    'clarity': ['I1', 'SI2', 'SI1', 'VS2', 'VS1', 'VVS2', 'VVS1', 'IF']
+}
+PLOTS = {
+    'scatter': {'title': "Price vs. Carat (Colored by Cut)", 'x': 'carat', 'y': 'price', 'type': 'scatter', 'hue': 'cut',
+                'density_threshold': 100_000}, # Rows above which the scatter is drawn as a density raster
+    'bar': {'title': "Average Price by Cut Quality", 'x': 'cut', 'y': 'price', 'type': 'bar', 'order': CAT_ORDERS['cut']}
+}
+COUNT_PLOTS = [
+    {'col': 'color', 'order': CAT_ORDERS['color'], 'title': 'Count by Color Grade (J-D)', 'plot_type': 'count'},
+    {'col': 'clarity', 'order': CAT_ORDERS['clarity'], 'title': 'Count by Clarity Grade (I1-IF)', 'plot_type': 'count'},
+    {'col': 'cut', 'order': CAT_ORDERS['cut'], 'title': 'Count by Cut Quality (Fair-Ideal)', 'plot_type': 'count'},
+    {'col': 'depth', 'order': None, 'title': 'Count Distribution by Depth (%)', 'plot_type': 'hist'}
+]
+STAT_COLUMNS = ['carat', 'price']
+PLOT_SIZE = (6, 4)
+COUNT_PLOTS_SIZE = (9, 7)
+MODEL_PLOT_SIZE = (10, 5)
+COMPARE_PLOTS_SIZE = (9, 9)
+RANGE_COLUMNS = ('carat', 'price') # Columns the filter panel queries by range
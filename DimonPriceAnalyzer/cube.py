@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+# --- Constants & Configuration ---
+MEASURES = ('price', 'carat')
+QUANTILES = (0.25, 0.5, 0.75)
+
+
+class AggregateCube:
+    """Per-cell count, sum, sum of squares, min and max over the ordered categorical dimensions.
+
+    Every dimension gets one extra trailing slot for rows whose category is
+    missing, so totals still match the full frame while marginals used for
+    plotting only report the ordered categories.
+    """
+
+    def __init__(self, cat_orders, measures=MEASURES):
+        self.cat_orders = dict(cat_orders)
+        self.dims = list(self.cat_orders)
+        self.measures = list(measures)
+        self.shape = tuple(len(order) + 1 for order in self.cat_orders.values())
+        self.rows = np.zeros(self.shape, dtype=np.int64)
+        self.stats = {m: {'n': np.zeros(self.shape, dtype=np.int64),
+                          'sum': np.zeros(self.shape),
+                          'sumsq': np.zeros(self.shape),
+                          'min': np.full(self.shape, np.inf),
+                          'max': np.full(self.shape, -np.inf)} for m in self.measures}
+        self.quantiles = None
+        self.histograms = {}  # col -> (counts, edges), filled in by streamed loads
+        self.extent = None    # Where in the source CSV the summarized rows end, set by analysis.load_dataset
+        self.model = None     # regression.PriceModel over the same rows, set by analysis loads
+
+    @classmethod
+    def build(cls, frame, cat_orders, measures=MEASURES):
+        """Builds the cube from a frame whose dimension columns are ordered categoricals."""
+        cube = cls(cat_orders, measures)
+        codes = {dim: frame[dim].cat.codes.to_numpy() for dim in cube.dims}
+        cube.add_arrays(codes, {m: frame[m].to_numpy() for m in cube.measures})
+        cube.quantiles = {m: frame[m].quantile(QUANTILES).to_numpy() for m in cube.measures}
+        return cube
+
+    def add_arrays(self, codes, values):
+        """Accumulates rows given as category code arrays (-1 = missing) and measure arrays."""
+        cell = np.zeros(len(next(iter(codes.values()))), dtype=np.intp)
+        for dim, size in zip(self.dims, self.shape):
+            cell = cell * size + np.where(codes[dim] < 0, size - 1, codes[dim])
+
+        n_cells = self.rows.size
+        self.rows += np.bincount(cell, minlength=n_cells).reshape(self.shape)
+        for m in self.measures:
+            v = np.asarray(values[m], dtype=float)
+            valid = ~np.isnan(v)
+            c, v = cell[valid], v[valid]
+            s = self.stats[m]
+            s['n'] += np.bincount(c, minlength=n_cells).reshape(self.shape)
+            s['sum'] += np.bincount(c, weights=v, minlength=n_cells).reshape(self.shape)
+            s['sumsq'] += np.bincount(c, weights=v * v, minlength=n_cells).reshape(self.shape)
+            np.fmin.at(s['min'].reshape(-1), c, v)
+            np.fmax.at(s['max'].reshape(-1), c, v)
+        self.quantiles = None
+
+    def merge(self, other):
+        """Adds another cube built over the same dimensions into this one."""
+        self.rows += other.rows
+        for m in self.measures:
+            s, o = self.stats[m], other.stats[m]
+            for key in ('n', 'sum', 'sumsq'):
+                s[key] += o[key]
+            np.fmin(s['min'], o['min'], out=s['min'])
+            np.fmax(s['max'], o['max'], out=s['max'])
+        self.quantiles = None
+        return self
+
+    # --- Queries ---
+
+    @property
+    def row_count(self):
+        return int(self.rows.sum())
+
+    def _reduce(self, dims, array, ufunc=np.add):
+        """Collapses every axis not in `dims` and drops the missing-category slots."""
+        axes = tuple(i for i, d in enumerate(self.dims) if d not in dims)
+        out = ufunc.reduce(array, axis=axes) if axes else array
+        return out[tuple(slice(0, len(self.cat_orders[d])) for d in self.dims if d in dims)]
+
+    def counts(self, dim):
+        """Row count per category of `dim`, in category order."""
+        return pd.Series(self._reduce([dim], self.rows), index=self.cat_orders[dim], name='count')
+
+    def marginal(self, dim, measure):
+        """Count, mean, std, min and max of `measure` per category of `dim`."""
+        s = self.stats[measure]
+        n, total, sumsq = (self._reduce([dim], s[k]) for k in ('n', 'sum', 'sumsq'))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = total / n
+            std = np.sqrt(np.maximum(sumsq - total * mean, 0) / (n - 1))
+        return pd.DataFrame({'count': n, 'mean': mean, 'std': std,
+                             'min': self._reduce([dim], s['min'], np.fmin),
+                             'max': self._reduce([dim], s['max'], np.fmax)},
+                            index=pd.Index(self.cat_orders[dim], name=dim))
+
+    def describe(self, measures=None):
+        """Equivalent of frame[measures].describe().T, answered from the cells."""
+        rows = {}
+        for m in measures or self.measures:
+            s = self.stats[m]
+            n, total, sumsq = s['n'].sum(), s['sum'].sum(), s['sumsq'].sum()
+            mean = total / n if n else np.nan
+            std = np.sqrt(max(sumsq - total * mean, 0) / (n - 1)) if n > 1 else np.nan
+            q = self.quantiles[m] if self.quantiles else [np.nan] * len(QUANTILES)
+            rows[m] = [float(n), mean, std, s['min'].min(), *q, s['max'].max()]
+        columns = ['count', 'mean', 'std', 'min', *(f"{q:.0%}" for q in QUANTILES), 'max']
+        return pd.DataFrame.from_dict(rows, orient='index', columns=columns)
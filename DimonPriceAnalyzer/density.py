@@ -0,0 +1,105 @@
+import numpy as np
+from matplotlib.image import AxesImage
+from matplotlib.patches import Patch
+
+# --- Constants & Configuration ---
+DEFAULT_BINS = (320, 220)  # (x bins, y bins) of the density raster
+ZOOM_STEP = 1.25           # Scroll-wheel zoom factor
+
+# --- Binning & Shading ---
+
+def padded(lo, hi):
+    """Widens a zero-width range (e.g. every stone filtered to one carat) so it can be binned."""
+    if hi > lo:
+        return lo, hi
+    pad = abs(lo) * 0.05 or 0.5
+    return lo - pad, hi + pad
+
+def bin_counts(x, y, codes, n_cats, x_range, y_range, bins=DEFAULT_BINS):
+    """Counts points per (category, y bin, x bin) in one vectorized pass over the rows."""
+    (x0, x1), (y0, y1), (w, h) = padded(*x_range), padded(*y_range), bins
+    keep = (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1) & (codes >= 0)
+
+    ix = ((x[keep] - x0) * (w / (x1 - x0))).astype(np.intp)
+    iy = ((y[keep] - y0) * (h / (y1 - y0))).astype(np.intp)
+    np.minimum(ix, w - 1, out=ix)
+    np.minimum(iy, h - 1, out=iy)
+
+    flat = (codes[keep].astype(np.intp) * h + iy) * w + ix
+    return np.bincount(flat, minlength=n_cats * h * w).reshape(n_cats, h, w)
+
+
+def shade(counts, colors):
+    """Blends per-category counts into an RGBA image; alpha follows log density."""
+    total = counts.sum(axis=0)
+    weights = counts / np.maximum(total, 1)
+    rgb = np.einsum('khw,kc->hwc', weights, np.asarray(colors, dtype=float))
+
+    alpha = np.log1p(total)
+    alpha /= max(alpha.max(), 1e-12)
+    return np.dstack([rgb, alpha])
+
+# --- Plot Artist ---
+
+class _BinnedImage(AxesImage):
+    """AxesImage that lets its DensityScatter re-bin once, right before a draw, after the view changed."""
+
+    def __init__(self, ax, owner, **kwargs):
+        super().__init__(ax, **kwargs)
+        self.owner = owner
+
+    def draw(self, renderer):
+        self.owner.refresh()
+        super().draw(renderer)
+
+
+class DensityScatter:
+    """Draws a scatter as a single density image and re-bins it when the view has changed.
+
+    Limit changes only mark the image stale; the re-bin happens once in the
+    next draw, however many limits a zoom or pan step set.
+    """
+
+    def __init__(self, ax, x, y, codes, labels, colors, title=None, bins=DEFAULT_BINS):
+        self.ax, self.bins = ax, bins
+        self.x = np.asarray(x)
+        self.y = np.asarray(y)
+        self.codes = np.asarray(codes)
+        self.colors = list(colors)[:len(labels)]
+
+        x_range = padded(np.nanmin(self.x), np.nanmax(self.x))
+        y_range = padded(np.nanmin(self.y), np.nanmax(self.y))
+        self.binned = (x_range, y_range) # Limits the image was last binned for
+        self.image = _BinnedImage(ax, self, origin='lower', interpolation='nearest')
+        self.image.set_data(self._render(x_range, y_range))
+        ax.add_image(self.image)
+        self.image.set_extent((*x_range, *y_range))
+        ax.set(xlim=x_range, ylim=y_range, aspect='auto')
+        ax.set_autoscale_on(False)
+        ax.legend(handles=[Patch(color=c, label=l) for c, l in zip(self.colors, labels)], title=title, fontsize=8)
+
+        ax.figure.canvas.mpl_connect('scroll_event', self._on_scroll)
+
+    def _render(self, x_range, y_range):
+        counts = bin_counts(self.x, self.y, self.codes, len(self.colors), x_range, y_range, self.bins)
+        return shade(counts, self.colors)
+
+    def refresh(self):
+        """Re-bins only the rows inside the current axis limits, if they changed since the last bin."""
+        x_range, y_range = tuple(self.ax.get_xlim()), tuple(self.ax.get_ylim())
+        if (x_range, y_range) == self.binned or x_range[0] >= x_range[1] or y_range[0] >= y_range[1]:
+            return
+        self.binned = (x_range, y_range)
+        self.image.set_data(self._render(x_range, y_range))
+        self.image.set_extent((*x_range, *y_range))
+
+    def _on_scroll(self, event):
+        """Zooms around the cursor; the image re-bins in the redraw this requests."""
+        if event.inaxes is not self.ax:
+            return
+        scale = 1 / ZOOM_STEP if event.button == 'up' else ZOOM_STEP
+        (x0, x1), (y0, y1) = self.ax.get_xlim(), self.ax.get_ylim()
+        cx, cy = event.xdata, event.ydata
+        self.ax.set_xlim(cx - (cx - x0) * scale, cx + (x1 - cx) * scale)
+        self.ax.set_ylim(cy - (cy - y0) * scale, cy + (y1 - cy) * scale)
+        self.ax.figure.canvas.draw_idle()
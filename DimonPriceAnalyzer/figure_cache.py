@@ -0,0 +1,44 @@
+from collections import OrderedDict
+
+# --- Constants & Configuration ---
+MAX_BYTES = 96 * 1024 * 1024  # Budget for cached canvases (Agg buffer + wx bitmap per figure)
+
+
+def canvas_bytes(canvas):
+    """Estimates the memory held by an embedded canvas from its figure's pixel size."""
+    width, height = canvas.figure.bbox.size
+    return int(width * height) * 4 * 2
+
+
+class FigureCache:
+    """LRU cache of embedded plot canvases keyed by (plot, data version, panel size)."""
+
+    def __init__(self, release, max_bytes=MAX_BYTES):
+        self.release = release  # Called with each evicted canvas to close and destroy it
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+
+    def __contains__(self, canvas):
+        return any(entry is canvas for entry, _ in self._entries.values())
+
+    def get(self, key):
+        """Returns the cached canvas for `key` (marking it most recently used) or None."""
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self._entries[key][0]
+
+    def put(self, key, canvas):
+        """Stores a canvas and evicts least recently used ones until under the memory cap."""
+        self._entries[key] = (canvas, canvas_bytes(canvas))
+        self._entries.move_to_end(key)
+        while len(self._entries) > 1 and sum(size for _, size in self._entries.values()) > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.release(evicted)
+
+    def clear(self, keep=None):
+        """Releases every cached canvas except `keep` (e.g. the one currently on screen)."""
+        for key, (canvas, size) in list(self._entries.items()):
+            if canvas is not keep:
+                del self._entries[key]
+                self.release(canvas)
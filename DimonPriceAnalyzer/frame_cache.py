@@ -0,0 +1,233 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+# --- Constants & Configuration ---
+CACHE_DIR = ".frame_cache"
+CACHE_VERSION = 5
+CURRENT = "current"   # File in a CSV's cache folder naming its live entry
+HASH_BLOCK = 1 << 20  # 1 MB reads while hashing the source file
+ANCHOR_BYTES = 64 * 1024  # Bytes hashed at each end of an already-loaded region
+MAX_PARTS = 16  # Appended row blocks per entry before append() declines and the frame is saved whole
+
+
+def _cache_path(path):
+    """Returns the cache directory used for a given CSV file.
+
+    It holds one subdirectory per saved version of the frame and a CURRENT
+    file naming the live one, so a new version never replaces files an
+    earlier frame may still be memory-mapping. Each version stores its columns
+    as one or more parts (`col.npy`, then `col.1.npy`, ... for appended rows).
+    """
+    folder, name = os.path.split(os.path.abspath(path))
+    return os.path.join(folder, CACHE_DIR, name)
+
+
+def _current_entry(cache):
+    try:
+        with open(os.path.join(cache, CURRENT)) as f:
+            return os.path.join(cache, f.read().strip())
+    except OSError:
+        return None
+
+
+def _stamp(name):
+    try:
+        return int(name.split('-')[0])
+    except ValueError:
+        return -1 # Not a versioned entry (e.g. an older cache layout)
+
+
+def _prune(cache, keep):
+    """Deletes entries older than `keep`.
+
+    Windows refuses to delete files that are still memory-mapped; those
+    entries are skipped and retried on a later save. Entries newer than
+    `keep` belong to a concurrent writer and are left alone.
+    """
+    for name in os.listdir(cache):
+        if name == CURRENT or name.endswith('.tmp') or _stamp(name) >= _stamp(keep):
+            continue
+        target = os.path.join(cache, name)
+        if os.path.isdir(target):
+            shutil.rmtree(target, ignore_errors=True)
+        else:
+            try:
+                os.remove(target)
+            except OSError:
+                pass
+
+
+def _part_file(col, part):
+    return f"{col}.npy" if part == 0 else f"{col}.{part}.npy"
+
+
+def file_digest(path, segments=(), start=0, seed=''):
+    """Returns the SHA-1 hex digest of a file from byte `start` on, read in fixed-size blocks.
+
+    At every offset in `segments` the digest restarts, seeded with the hex
+    digest so far; `seed` is the digest of everything before `start`. So a
+    file that was only appended to is hashed by reading just the new bytes.
+    """
+    digest = hashlib.sha1(seed.encode())
+    with open(path, 'rb') as f:
+        f.seek(start)
+        for end in [*(offset for offset in segments if offset > start), None]:
+            while end is None or f.tell() < end:
+                block = f.read(HASH_BLOCK if end is None else min(HASH_BLOCK, end - f.tell()))
+                if not block:
+                    break
+                digest.update(block)
+            if end is not None:
+                digest = hashlib.sha1(digest.hexdigest().encode())
+    return digest.hexdigest()
+
+
+def tail_anchor(path, offset):
+    """Digest of the file's first ANCHOR_BYTES and the ANCHOR_BYTES ending at `offset`.
+
+    It stays the same while the file is only appended to, so a changed
+    anchor means the already-loaded region was rewritten.
+    """
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        digest.update(f.read(min(ANCHOR_BYTES, offset)))
+        f.seek(max(offset - ANCHOR_BYTES, 0))
+        digest.update(f.read(min(ANCHOR_BYTES, offset)))
+    return digest.hexdigest()
+
+def source_signature(path, cat_orders, segments=()):
+    """Builds the key a cache entry must match: file size, mtime, hash and category orders.
+
+    `segments` are the file sizes earlier appends were hashed from (see appended_signature).
+    """
+    st = os.stat(path)
+    return {
+        'version': CACHE_VERSION,
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'sha1': file_digest(path, segments),
+        'segments': list(segments),
+        'cat_orders': cat_orders,
+    }
+
+
+def appended_signature(path, signature):
+    """The signature of `path` after bytes were appended to the file `signature` describes.
+
+    Only the new bytes are hashed, chained onto the stored digest.
+    """
+    st = os.stat(path)
+    return dict(signature, size=st.st_size, mtime_ns=st.st_mtime_ns,
+                sha1=file_digest(path, start=signature['size'], seed=signature['sha1']),
+                segments=[*signature['segments'], signature['size']])
+
+
+def _read_meta(entry):
+    with open(os.path.join(entry, 'meta.json')) as f:
+        return json.load(f)
+
+
+def load(path, cat_orders):
+    """Returns (frame, meta) memory-mapped from the cache, or None if missing or stale.
+
+    Columns saved in several parts are joined into one in-memory array.
+    """
+    cache = _current_entry(_cache_path(path))
+    if cache is None:
+        return None
+    try:
+        meta = _read_meta(cache)
+        signature = source_signature(path, cat_orders, meta['signature'].get('segments', ()))
+        if meta['signature'] != json.loads(json.dumps(signature)):
+            return None
+
+        columns = {}
+        for col in meta['columns']:
+            parts = [np.load(os.path.join(cache, _part_file(col, part)), mmap_mode='r')
+                     for part in range(len(meta['parts']))]
+            values = parts[0] if len(parts) == 1 else np.concatenate(parts)
+            if col in cat_orders:
+                values = pd.Categorical.from_codes(values, categories=cat_orders[col], ordered=True)
+            columns[col] = values
+        return pd.DataFrame(columns, copy=False), meta
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _new_entry(path, fill):
+    """Creates a new entry, lets `fill(entry)` write its columns and return its meta, then makes it current."""
+    cache = _cache_path(path)
+    name = f"{time.time_ns()}-{os.getpid()}"  # Unique per process, so parallel writers never share an entry
+    entry = os.path.join(cache, name)
+    os.makedirs(entry)
+
+    try:
+        meta = fill(entry)
+        with open(os.path.join(entry, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+        # Point at the finished entry so a crash never leaves a half-written cache behind
+        pointer = os.path.join(cache, f"{CURRENT}.{os.getpid()}.tmp")
+        with open(pointer, 'w') as f:
+            f.write(name)
+        os.replace(pointer, os.path.join(cache, CURRENT))
+    except OSError:
+        shutil.rmtree(entry, ignore_errors=True)
+        raise
+    _prune(cache, name)
+
+
+def _save_part(entry, frame, cat_orders, part):
+    for col in frame.columns:
+        values = frame[col].cat.codes if col in cat_orders else frame[col]
+        np.save(os.path.join(entry, _part_file(col, part)), np.ascontiguousarray(values.to_numpy()))
+
+
+def save(path, frame, signature, **extra):
+    """Writes the cleaned frame as a new entry of one .npy file per column (categoricals stored as codes)."""
+    def fill(entry):
+        _save_part(entry, frame, signature['cat_orders'], 0)
+        return {'signature': signature, 'columns': list(frame.columns), 'parts': [len(frame)], **extra}
+    _new_entry(path, fill)
+
+
+def append(path, rows, base, signature, **extra):
+    """Adds `rows` to the current entry as one more part, writing only those rows.
+
+    The new entry hard-links the current entry's part files. Returns False
+    without writing anything when the current entry is not the one `base`
+    (its signature) describes, has other columns or already holds MAX_PARTS parts.
+    """
+    current = _current_entry(_cache_path(path))
+    try:
+        meta = _read_meta(current)
+    except (TypeError, OSError, ValueError):
+        return False
+    if (meta.get('signature') != json.loads(json.dumps(base)) or meta.get('columns') != list(rows.columns)
+            or len(meta.get('parts', ())) >= MAX_PARTS):
+        return False
+
+    def fill(entry):
+        for part in range(len(meta['parts'])):
+            for col in meta['columns']:
+                os.link(os.path.join(current, _part_file(col, part)), os.path.join(entry, _part_file(col, part)))
+        _save_part(entry, rows, signature['cat_orders'], len(meta['parts']))
+        return {**meta, 'signature': signature, 'parts': [*meta['parts'], len(rows)], **extra}
+    _new_entry(path, fill)
+    return True
+
+
+def invalidate(path):
+    """Removes the cache entries of a CSV so its next load reads the file again."""
+    cache = _cache_path(path)
+    try:
+        os.remove(os.path.join(cache, CURRENT))
+    except OSError:
+        pass
+    shutil.rmtree(cache, ignore_errors=True) # Mapped entries may survive on Windows; they are no longer current
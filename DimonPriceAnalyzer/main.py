@@ -1,59 +1,186 @@
-import pandas as pd
+import sys
+import startup_profile
+PROFILE_STARTUP = '--profile-startup' in sys.argv # Prints import times and time-to-interactive, then exits
+if PROFILE_STARTUP:
+    startup_profile.install()
+import math
+import numbers
+import os
+import threading
+import time
 import wx
 from wx.lib.pubsub import pub
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_wxagg import FigureCanvasWxAgg
-import seaborn as sns
-import numpy as np
+from config import CAT_ORDERS, PLOTS, STAT_COLUMNS, PLOT_SIZE, COUNT_PLOTS_SIZE, MODEL_PLOT_SIZE, RANGE_COLUMNS, \
+    COMPARE_PLOTS_SIZE
+from figure_cache import FigureCache
+# pandas, NumPy, seaborn and matplotlib are imported on first use (and prewarmed in the
+# background, see prewarm_plotting) so the window can appear before they have loaded
 
 # --- Constants & Configuration ---
 LIGHT_BLUE = wx.Colour(173, 216, 230)
 FILE_PATH = "diamonds.csv"
-CAT_ORDERS = {
-    'cut': ['Fair', 'Good', 'Very Good', 'Premium', 'Ideal'],
-    'color': ['J', 'I', 'H', 'G', 'F', 'E', 'D'],
-    'clarity': ['I1', 'SI2', 'SI1', 'VS2', 'VS1', 'VVS2', 'VVS1', 'IF']
-}
-PLOTS = {
-    'scatter': {'title': "Price vs. Carat (Colored by Cut)", 'x': 'carat', 'y': 'price', 'type': 'scatter', 'hue': 'cut'},
-    'bar': {'title': "Average Price by Cut Quality", 'x': 'cut', 'y': 'price', 'type': 'bar', 'order': CAT_ORDERS['cut']}
-}
-COUNT_PLOTS = [
-    {'col': 'color', 'order': CAT_ORDERS['color'], 'title': 'Count by Color Grade (J-D)', 'plot_type': 'count'},
-    {'col': 'clarity', 'order': CAT_ORDERS['clarity'], 'title': 'Count by Clarity Grade (I1-IF)', 'plot_type': 'count'},
-    {'col': 'cut', 'order': CAT_ORDERS['cut'], 'title': 'Count by Cut Quality (Fair-Ideal)', 'plot_type': 'count'},
-    {'col': 'depth', 'order': None, 'title': 'Count Distribution by Depth (%)', 'plot_type': 'hist'}
-]
-
+CSV_WILDCARD = "CSV files (*.csv)|*.csv"
+STARTUP_MILESTONES = ("window shown", "data loaded", "plotting stack ready")
 df = None # Global DataFrame
+cube = None # Global AggregateCube over CAT_ORDERS, built alongside df
+data_version = 0 # Bumped on every swap so cached figures of older data are never reused
+selection_index = None # SelectionIndex over df, built by the loader
+active_filter = {} # Column -> kept categories or (low, high); see SelectionIndex.select
+view_df = None # df and cube restricted to active_filter (the full data when unfiltered)
+view_cube = None
 
 # --- Data Core ---
 
-def load_data(path):
-    """Loads and cleans the diamond dataset."""
-    global df
-    try:
-        df = pd.read_csv(path).drop(columns=['Unnamed: 0'], errors='ignore')
-        initial_rows = len(df)
-        df = df[(df[['x', 'y', 'z']] != 0).all(axis=1)]
-        cleaned_rows = len(df)
-
-        for col, order in CAT_ORDERS.items():
-            df[col] = pd.Categorical(df[col], categories=order, ordered=True)
-
-        pub.sendMessage("DATA_LOADED", success=True, 
-                        message=f"✅ Data loaded! Initial: {initial_rows:,}, Cleaned: {cleaned_rows:,} diamonds.")
-    except Exception as e:
-        pub.sendMessage("DATA_LOADED", success=False, message=f"❌ Error: {e}.")
-        df = None
+def set_data(frame, frame_cube, initial_rows, source, index=None):
+    """Swaps in a freshly loaded frame and cube and announces them. Must run on the GUI thread."""
+    from analysis import memory_footprint
+    from selection import SelectionIndex
+    global df, cube, data_version, selection_index
+    df, cube = frame, frame_cube
+    selection_index = index if index is not None or frame is None else SelectionIndex(frame, CAT_ORDERS)
+    data_version += 1
+    set_filter(active_filter)
+    if frame is None:
+        detail = " Streamed summary only (scatter plot unavailable)."
+    else:
+        default_bytes, compact_bytes = memory_footprint(frame)
+        detail = f" Memory: {default_bytes / 2**20:,.1f} MB -> {compact_bytes / 2**20:,.1f} MB."
+    pub.sendMessage("DATA_LOADED", success=True, 
+                    message=f"✅ Data loaded from {source}! Initial: {initial_rows:,}, Cleaned: {frame_cube.row_count:,} diamonds." + detail)
+
+def set_error(error):
+    """Clears the data and announces the load failure. Must run on the GUI thread."""
+    global df, cube, data_version, selection_index, view_df, view_cube
+    df = cube = selection_index = view_df = view_cube = None
+    data_version += 1
+    pub.sendMessage("DATA_LOADED", success=False, message=f"❌ Error: {error}.")
+
+def set_filter(filters):
+    """Restricts view_df/view_cube to `filters`, resolved through the selection index. Must run on the GUI thread."""
+    from cube import AggregateCube
+    global active_filter, view_df, view_cube
+    active_filter = filters
+    rows = selection_index.select(filters) if selection_index is not None else None
+    if rows is None:
+        view_df, view_cube = df, cube
+    else:
+        view_df = df.iloc[rows]
+        view_cube = AggregateCube.build(view_df, CAT_ORDERS)
+
+def prewarm_plotting(done=None):
+    """Imports the data core and plotting stack (pandas, seaborn, matplotlib's wx backend), then calls `done()`.
+
+    Run on a background thread while the data loads, so the first plot click does not wait on imports.
+    """
+    import analysis
+    import matplotlib.pyplot
+    import matplotlib.backends.backend_wxagg
+    if done:
+        done()
+
+def filter_key():
+    """Hashable form of active_filter, for figure cache keys."""
+    return tuple((col, tuple(value)) for col, value in sorted(active_filter.items()))
 
 def get_stats():
-    """Returns the descriptive statistics DataFrame."""
-    return df[['carat', 'price']].describe().T if df is not None else None
+    """Returns the descriptive statistics DataFrame of the filtered view."""
+    return view_cube.describe(STAT_COLUMNS) if view_cube is not None else None
+
+# --- Background Loading ---
+
+class DataLoader:
+    """Runs load_dataset on a worker thread and hands the result to the GUI thread.
+
+    Starting a new load cancels the previous one; anything a cancelled worker
+    still posts is dropped, so DATA_LOADED only fires for the latest request.
+    An incremental load only parses rows appended since the current data was
+    loaded (append_dataset), falling back to a full load if the file changed.
+    adopt() hands over an already loaded frame, indexing it on the worker too.
+    """
+    def __init__(self):
+        self._cancel = None
+
+    def start(self, path, incremental=False):
+        self.cancel()
+        cancel = self._cancel = threading.Event()
+        current = (df, cube) if incremental else None # Captured here, on the GUI thread
+        threading.Thread(target=self._run, args=(path, cancel, current), daemon=True).start()
+
+    def adopt(self, frame, frame_cube, initial_rows, source):
+        """Makes an already loaded frame (e.g. a compared dataset) the data once its SelectionIndex is built."""
+        self.cancel()
+        cancel = self._cancel = threading.Event()
+        threading.Thread(target=self._index, args=(cancel, frame, frame_cube, initial_rows, source), daemon=True).start()
+
+    def cancel(self):
+        if self._cancel:
+            self._cancel.set()
+
+    def _index(self, cancel, frame, frame_cube, initial_rows, source):
+        from selection import SelectionIndex
+        index = SelectionIndex(frame, CAT_ORDERS) if frame is not None else None
+        wx.CallAfter(self._deliver, cancel, set_data, frame, frame_cube, initial_rows, source, index)
+
+    def _run(self, path, cancel, current):
+        from analysis import load_dataset, append_dataset
+        from selection import SelectionIndex
+
+        def progress(rows, percent):
+            wx.CallAfter(self._deliver, cancel, pub.sendMessage, "DATA_PROGRESS", rows=rows, percent=percent)
+
+        try:
+            if current is not None:
+                result = append_dataset(path, *current, progress, cancel.is_set)
+            else:
+                result = load_dataset(path, progress, cancel.is_set)
+            if result is not None and result[0] is not None and not cancel.is_set():
+                result = (*result, SelectionIndex(result[0], CAT_ORDERS)) # Sorting millions of rows stays off the GUI thread
+        except Exception as e:
+            wx.CallAfter(self._deliver, cancel, set_error, e)
+            return
+        if result is not None:
+            wx.CallAfter(self._deliver, cancel, set_data, *result)
+
+    @staticmethod
+    def _deliver(cancel, func, *args, **kwargs):
+        if not cancel.is_set():
+            func(*args, **kwargs)
+
+def load_comparison(paths, on_loaded, on_done):
+    """Loads `paths` in parallel worker processes (compare.load_many) from a background thread.
+
+    `on_loaded(path)` and `on_done(datasets, errors)` are called on the GUI thread.
+    """
+    def run():
+        from compare import load_many
+        try:
+            result = load_many(paths, on_loaded=lambda path: wx.CallAfter(on_loaded, path))
+        except Exception as e: # The pool itself failed to start
+            result = [], {path: e for path in paths}
+        wx.CallAfter(on_done, *result)
+    threading.Thread(target=run, daemon=True).start()
 
 # --- GUI Class ---
 
+def create_stats_list(parent, data):
+    """Helper to create and populate the wx.ListCtrl."""
+    # Note: wx.ListCtrl also does not take 'background_color'
+    list_ctrl = wx.ListCtrl(parent, style=wx.LC_REPORT) 
+    list_ctrl.SetBackgroundColour(LIGHT_BLUE)
+    
+    list_ctrl.InsertColumn(0, "Feature", width=80)
+    for i, col in enumerate(data.columns):
+        list_ctrl.InsertColumn(i + 1, col.capitalize(), width=70, format=wx.LIST_FORMAT_RIGHT)
+    
+    for i, (index, row) in enumerate(data.iterrows()):
+        list_ctrl.InsertItem(i, index.capitalize())
+        for j, val in enumerate(row):
+            formatted = f"{val:,.2f}" if isinstance(val, numbers.Real) else str(val)
+            list_ctrl.SetItem(i, j + 1, formatted)
+    
+    list_ctrl.SetMinSize((-1, 25 + (len(data) * 22) + 15)) 
+    return list_ctrl
+
 class DiamondFrame(wx.Frame):
     def __init__(self, parent, title):
         super().__init__(parent, title=title, size=(1000, 700))
@@ -66,12 +193,21 @@ class DiamondFrame(wx.Frame):
         self.status_bar = self.CreateStatusBar()
         self.status_bar.SetStatusText(f"Ready. Loading {FILE_PATH}...")
         self.current_plot_widget = None
+        self.figure_cache = FigureCache(self._release_canvas)
+        self._redraw = None # Re-renders the current plot after a filter change
+        self.summary_shown = False
 
         self._setup_ui()
         self.Show()
+        self._pending_milestones = set(STARTUP_MILESTONES)
+        wx.CallAfter(self._on_startup_milestone, "window shown")
+        threading.Thread(target=prewarm_plotting, daemon=True,
+                         args=(lambda: wx.CallAfter(self._on_startup_milestone, "plotting stack ready"),)).start()
 
         pub.subscribe(self._on_data_loaded, "DATA_LOADED")
-        wx.CallLater(100, lambda: load_data(FILE_PATH))
+        pub.subscribe(self._on_data_progress, "DATA_PROGRESS")
+        self.loader = DataLoader()
+        self.loader.start(FILE_PATH)
         self.Bind(wx.EVT_CLOSE, self._on_close)
 
     def _add_text(self, label, parent, sizer=None, size=14, style=wx.FONTWEIGHT_NORMAL, flag=wx.ALIGN_CENTER | wx.TOP | wx.BOTTOM, border=5):
@@ -97,6 +233,9 @@ class DiamondFrame(wx.Frame):
         load_btn = wx.Button(self.panel, label="Load Diamond Data")
         load_btn.Bind(wx.EVT_BUTTON, self._on_reload_data)
         control_sizer.Add(load_btn, 0, wx.ALL | wx.CENTER, 5)
+        self.compare_btn = wx.Button(self.panel, label="Compare Datasets...")
+        self.compare_btn.Bind(wx.EVT_BUTTON, self._on_compare_datasets)
+        control_sizer.Add(self.compare_btn, 0, wx.ALL | wx.CENTER, 5)
         self.main_sizer.Add(control_sizer, 0, wx.EXPAND | wx.ALL, 10)
 
         # Splitter setup
@@ -139,6 +278,8 @@ class DiamondFrame(wx.Frame):
         self.summary_sizer.AddStretchSpacer(1)
         self.left_sizer.Add(self.summary_area, 1, wx.EXPAND | wx.ALL, 10)
 
+        self._setup_filter_controls()
+
         # Visualization Controls
         button_sizer = wx.BoxSizer(wx.VERTICAL)
         self._add_text("Visualizations & Report", self.left_panel, button_sizer, size=12, style=wx.FONTWEIGHT_BOLD, flag=wx.ALIGN_CENTER | wx.TOP | wx.BOTTOM, border=10)
@@ -146,11 +287,91 @@ class DiamondFrame(wx.Frame):
         self.scatter_btn = self._create_btn("Carat vs. Price Scatter Plot", lambda evt: self._update_plot(PLOTS['scatter']), button_sizer)
         self.bar_btn = self._create_btn("Average Price by Cut Quality Bar Plot", lambda evt: self._update_plot(PLOTS['bar']), button_sizer)
         self.count_plots_btn = self._create_btn("Categorical Count Plots", self._on_show_count_plots, button_sizer)
+        self.model_btn = self._create_btn("Price Model (4 Cs) Coefficients & Residuals", self._on_show_price_model, button_sizer)
         self.report_btn = self._create_btn("Diamond Quality Report", self._on_show_quality_report, button_sizer)
 
         self.left_sizer.Add(button_sizer, 0, wx.EXPAND | wx.ALL, 10)
         self.left_sizer.Layout()
 
+    def _setup_filter_controls(self):
+        filter_sizer = wx.BoxSizer(wx.VERTICAL)
+        self._add_text("Filters", self.left_panel, filter_sizer, size=12, style=wx.FONTWEIGHT_BOLD)
+        self.filter_controls = []
+
+        self.filter_checks = {}
+        for col, order in CAT_ORDERS.items():
+            row = wx.WrapSizer(wx.HORIZONTAL)
+            row.Add(wx.StaticText(self.left_panel, label=f"{col.capitalize()}:"), 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 4)
+            self.filter_checks[col] = []
+            for name in order:
+                box = wx.CheckBox(self.left_panel, label=name)
+                box.SetValue(True)
+                box.Bind(wx.EVT_CHECKBOX, self._on_filter_changed)
+                row.Add(box, 0, wx.RIGHT, 4)
+                self.filter_checks[col].append(box)
+                self.filter_controls.append(box)
+            filter_sizer.Add(row, 0, wx.EXPAND | wx.ALL, 2)
+
+        self.filter_ranges = {}
+        for col in RANGE_COLUMNS:
+            row = wx.BoxSizer(wx.HORIZONTAL)
+            row.Add(wx.StaticText(self.left_panel, label=f"{col.capitalize()} from"), 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 4)
+            low = wx.TextCtrl(self.left_panel, size=(70, -1), style=wx.TE_PROCESS_ENTER)
+            row.Add(low, 0, wx.RIGHT, 4)
+            row.Add(wx.StaticText(self.left_panel, label="to"), 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 4)
+            high = wx.TextCtrl(self.left_panel, size=(70, -1), style=wx.TE_PROCESS_ENTER)
+            row.Add(high, 0)
+            for ctrl in (low, high):
+                ctrl.Bind(wx.EVT_TEXT_ENTER, self._on_filter_changed)
+                self.filter_controls.append(ctrl)
+            self.filter_ranges[col] = (low, high)
+            filter_sizer.Add(row, 0, wx.ALL, 2)
+
+        clear_btn = wx.Button(self.left_panel, label="Clear Filters")
+        clear_btn.Bind(wx.EVT_BUTTON, self._on_clear_filters)
+        filter_sizer.Add(clear_btn, 0, wx.EXPAND | wx.ALL, 5)
+        self.filter_controls.append(clear_btn)
+
+        for ctrl in self.filter_controls:
+            ctrl.Disable()
+        self.left_sizer.Add(filter_sizer, 0, wx.EXPAND | wx.LEFT | wx.RIGHT, 10)
+
+    def _read_filters(self):
+        """Builds the filter dict from the panel; raises ValueError on a bad or non-finite range bound."""
+        filters = {col: [box.GetLabel() for box in boxes if box.GetValue()] for col, boxes in self.filter_checks.items()}
+        for col, ctrls in self.filter_ranges.items():
+            filters[col] = tuple(float(ctrl.GetValue()) if ctrl.GetValue().strip() else None for ctrl in ctrls)
+            if not all(bound is None or math.isfinite(bound) for bound in filters[col]):
+                raise ValueError(f"{col} bounds must be finite") # float() accepts 'nan' and 'inf'
+        return filters
+
+    def _on_filter_changed(self, event):
+        """Applies the panel's filter and refreshes the summary and the current plot."""
+        try:
+            filters = self._read_filters()
+        except ValueError:
+            return self.status_bar.SetStatusText("Range bounds must be finite numbers.")
+        if cube is None: return
+        start = time.perf_counter()
+        set_filter(filters)
+        elapsed = time.perf_counter() - start
+
+        if self.summary_shown:
+            self._on_show_summary(None)
+        if self._redraw:
+            self._redraw()
+        self.status_bar.SetStatusText(f"Filter: {view_cube.row_count:,} of {cube.row_count:,} diamonds "
+                                      f"(selected in {elapsed * 1000:.0f} ms).")
+
+    def _on_clear_filters(self, event):
+        for boxes in self.filter_checks.values():
+            for box in boxes:
+                box.SetValue(True)
+        for ctrls in self.filter_ranges.values():
+            for ctrl in ctrls:
+                ctrl.SetValue("")
+        self._on_filter_changed(event)
+
     def _setup_right_plot_area(self):
         self.plot_placeholder = self._add_text("Visualization Area", self.right_panel, self.right_sizer, size=14, style=wx.FONTWEIGHT_BOLD, flag=wx.ALL | wx.CENTER)
         self.right_sizer.SetItemMinSize(self.plot_placeholder, -1, 400)
@@ -158,49 +379,143 @@ class DiamondFrame(wx.Frame):
 
     def _on_close(self, event):
         """Handle the window close event for clean exit."""
+        self.loader.cancel()
         self._cleanup_plot_area() 
+        self.figure_cache.clear()
         event.Skip() 
         self.Destroy() 
 
+    def _on_startup_milestone(self, name):
+        """Records a startup milestone; with --profile-startup, reports and exits once all have been reached."""
+        startup_profile.mark(name)
+        self._pending_milestones.discard(name)
+        if PROFILE_STARTUP and not self._pending_milestones:
+            startup_profile.mark("time to interactive")
+            startup_profile.report()
+            self.Close()
+
     def _cleanup_plot_area(self):
-        """Cleans up the current Matplotlib/report widget."""
+        """Cleans up the current Matplotlib/report widget; cached canvases are only hidden."""
         if self.current_plot_widget:
-            if isinstance(self.current_plot_widget, FigureCanvasWxAgg):
-                plt.close(self.current_plot_widget.figure) 
-            self.current_plot_widget.Destroy()
+            if self.current_plot_widget in self.figure_cache:
+                self.current_plot_widget.Hide()
+                self.right_sizer.Detach(self.current_plot_widget)
+            else:
+                self._release_canvas(self.current_plot_widget)
             self.current_plot_widget = None
             self.right_sizer.Layout()
 
+    def _release_canvas(self, widget):
+        """Closes a widget's figure (if any) and destroys the widget."""
+        figure = getattr(widget, 'figure', None) # Only plot canvases carry a figure
+        if figure is not None:
+            import matplotlib.pyplot as plt
+            plt.close(figure)
+        widget.Destroy()
+
+    def _plot_key(self, name):
+        """Figure cache key: plot name, data version, active filter and the current plot panel size."""
+        return (name, data_version, filter_key(), tuple(self.right_panel.GetSize()))
+
+    def _show_plot(self, canvas, message):
+        """Places a canvas in the plot area and reports it in the status bar."""
+        canvas.Show()
+        self.right_sizer.Add(canvas, 1, wx.EXPAND | wx.ALL, 5)
+        self.current_plot_widget = canvas
+        self.right_sizer.Layout()
+        self.status_bar.SetStatusText(message)
+
+    def _show_cached_plot(self, key, message):
+        """Re-shows a cached canvas for `key`; returns False if it has to be rendered."""
+        canvas = self.figure_cache.get(key)
+        if canvas is None:
+            return False
+        self._cleanup_plot_area()
+        self._show_plot(canvas, message)
+        return True
+
+    def _embed_figure(self, fig, key, message):
+        """Wraps a new figure in a canvas, caches it and shows it."""
+        from matplotlib.backends.backend_wxagg import FigureCanvasWxAgg
+        canvas = FigureCanvasWxAgg(self.right_panel, -1, fig)
+        self.figure_cache.put(key, canvas)
+        self._show_plot(canvas, message)
+
     def _on_reload_data(self, event):
-        """Triggers a reload of the default CSV file and clears summary area."""
-        self.status_bar.SetStatusText(f"Reloading data from: {FILE_PATH}...")
+        """Triggers an incremental reload of the default CSV file and clears summary area."""
+        self.status_bar.SetStatusText(f"Reloading data from: {FILE_PATH} (new rows only)...")
         self.summary_sizer.Clear(True)
         self.summary_sizer.AddStretchSpacer(1)
         self.summary_area.Layout()
-        load_data(FILE_PATH)
+        self.summary_shown = False
+        self.loader.start(FILE_PATH, incremental=True)
+
+    def _on_compare_datasets(self, event):
+        """Asks for several CSV files and loads them side by side in worker processes."""
+        with wx.FileDialog(self, "Choose CSV files to compare", wildcard=CSV_WILDCARD,
+                           style=wx.FD_OPEN | wx.FD_MULTIPLE | wx.FD_FILE_MUST_EXIST) as dialog:
+            if dialog.ShowModal() != wx.ID_OK:
+                return
+            paths = dialog.GetPaths()
+        if len(paths) < 2: return self.status_bar.SetStatusText("Choose at least two CSV files to compare.")
+
+        self.compare_btn.Disable()
+        self.status_bar.SetStatusText(f"Loading {len(paths)} datasets in parallel...")
+        loaded = []
+        def on_loaded(path):
+            loaded.append(path)
+            if self: self.status_bar.SetStatusText(f"Loading {len(paths)} datasets in parallel... {len(loaded)} done")
+        load_comparison(paths, on_loaded, self._on_comparison_loaded)
+
+    def _on_comparison_loaded(self, datasets, errors):
+        if not self: # Main window closed while loading
+            for dataset in datasets:
+                dataset.release()
+            return
+        self.compare_btn.Enable()
+        failed = "; ".join(f"{os.path.basename(path)}: {e}" for path, e in errors.items())
+        if not datasets:
+            return self.status_bar.SetStatusText(f"❌ Comparison failed. {failed}")
+        CompareFrame(self, datasets).Show()
+        self.status_bar.SetStatusText(f"✅ Comparing {len(datasets)} datasets." + (f" ❌ Skipped {failed}" if failed else ""))
+
+    def _on_data_progress(self, rows, percent):
+        """Shows background loading progress in the status bar."""
+        self.status_bar.SetStatusText(f"Loading {FILE_PATH}... {rows:,} rows read ({percent:.0f}%)")
 
     def _on_data_loaded(self, success, message):
         """Updates GUI status and enables/disables buttons."""
+        self.figure_cache.clear(keep=self.current_plot_widget)
         self.status_bar.SetStatusText(message)
-        for btn in [self.summary_btn, self.scatter_btn, self.bar_btn, self.count_plots_btn, self.report_btn]:
+        self._on_startup_milestone("data loaded")
+        for btn in [self.summary_btn, self.bar_btn, self.count_plots_btn, self.model_btn, self.report_btn]:
             btn.Enable(success)
+        self.scatter_btn.Enable(success and df is not None)
+        for ctrl in self.filter_controls:
+            ctrl.Enable(success and df is not None) # Streamed loads keep no rows to filter
 
     def _on_show_quality_report(self, event):
         """Generates and displays a text report."""
-        if df is None: return self.status_bar.SetStatusText("Data not loaded.")
+        if cube is None: return self.status_bar.SetStatusText("Data not loaded.")
         self._cleanup_plot_area()
+        self._redraw = None
         
+        coefs = cube.model.coefficients()
         report = (
             "DIAMOND QUALITY AND PRICE DRIVERS\n" "================================\n\n"
             "Prices are driven by '4 Cs': Carat, Cut, Color, and Clarity.\n\n"
-            "1. CARAT (Weight): Most significant factor. Price scales exponentially.\n\n"
+            f"1. CARAT (Weight): Most significant factor. Fitted price ∝ carat^{coefs.loc['log_carat', 'coef']:.2f} "
+            f"(doubling carat multiplies price by {2 ** coefs.loc['log_carat', 'coef']:.1f}x).\n\n"
             "2. CUT (Quality): Proportions maximize brilliance.\n"
             "• Grades: Fair < Good < Very Good < Premium < Ideal. Higher grade = Higher price.\n\n"
             "3. COLOR (Whiteness): Absence of color (D is best).\n"
             "• Grades: D (Colorless) down to J (Faint Yellow). D, E, F command premiums.\n\n"
             "4. CLARITY (Internal Flaws/Inclusions): Flawlessness.\n"
             "• Grades: I1 < ... < VS2 < VS1 < VVS2 < VVS1 < IF (Flawless).\n\n"
-            "GOOD QUALITY: Balances aesthetics and value (Cut: Ideal/Premium, Color: D-G, Clarity: VS2-IF)."
+            "GOOD QUALITY: Balances aesthetics and value (Cut: Ideal/Premium, Color: D-G, Clarity: VS2-IF).\n\n"
+            f"MODEL: log(price) on log(carat) + grades explains {cube.model.r_squared():.1%} of the variance; "
+            f"best grades add {coefs.loc['cut=Ideal', 'multiplier'] - 1:.0%} (Ideal cut), "
+            f"{coefs.loc['color=D', 'multiplier'] - 1:.0%} (D color), {coefs.loc['clarity=IF', 'multiplier'] - 1:.0%} (IF clarity)."
         )
 
         report_display = self._add_text(report, self.right_panel, self.right_sizer, size=11, flag=wx.EXPAND | wx.ALL, border=15)
@@ -208,35 +523,22 @@ class DiamondFrame(wx.Frame):
         self.right_sizer.Layout()
         self.status_bar.SetStatusText("Diamond Quality Report Generated.")
 
-    def _create_list_ctrl(self, data):
-        """Helper to create and populate the wx.ListCtrl."""
-        # Note: wx.ListCtrl also does not take 'background_color'
-        list_ctrl = wx.ListCtrl(self.summary_area, style=wx.LC_REPORT) 
-        list_ctrl.SetBackgroundColour(LIGHT_BLUE)
-        
-        list_ctrl.InsertColumn(0, "Feature", width=80)
-        for i, col in enumerate(data.columns):
-            list_ctrl.InsertColumn(i + 1, col.capitalize(), width=70, format=wx.LIST_FORMAT_RIGHT)
-        
-        for i, (index, row) in enumerate(data.iterrows()):
-            list_ctrl.InsertItem(i, index.capitalize())
-            for j, val in enumerate(row):
-                formatted = f"{val:,.2f}" if isinstance(val, (int, float, np.floating)) else str(val)
-                list_ctrl.SetItem(i, j + 1, formatted)
-        
-        list_ctrl.SetMinSize((-1, 25 + (len(data) * 22) + 15)) 
-        return list_ctrl
-
     def _on_show_summary(self, event):
         """Displays descriptive statistics in a wx.ListCtrl."""
         summary = get_stats()
         if summary is None: return self.status_bar.SetStatusText("Data not loaded.")
 
         self.summary_sizer.Clear(True)
-        list_ctrl = self._create_list_ctrl(summary)
+        self.summary_shown = True # Kept on, so widening the filter brings the table back
+        if not view_cube.row_count:
+            self._add_text("No diamonds match the active filter.", self.summary_area, self.summary_sizer, size=10, flag=wx.ALL | wx.CENTER)
+            self.summary_sizer.Layout()
+            self.left_sizer.Layout()
+            return self.status_bar.SetStatusText("No diamonds match the active filter.")
+        list_ctrl = create_stats_list(self.summary_area, summary)
         self.summary_sizer.Add(list_ctrl, 0, wx.EXPAND | wx.ALL, 5)
 
-        footer_text = f"Total Diamonds: {len(df):,} | Mean Price: ${df['price'].mean():,.2f}"
+        footer_text = f"Total Diamonds: {view_cube.row_count:,} | Mean Price: ${summary.loc['price', 'mean']:,.2f}"
         self._add_text(footer_text, self.summary_area, self.summary_sizer, size=10, flag=wx.ALL | wx.CENTER)
 
         self.summary_sizer.Layout()
@@ -244,54 +546,119 @@ class DiamondFrame(wx.Frame):
 
     def _update_plot(self, config):
         """Generates and embeds a Matplotlib plot based on config."""
-        if df is None: return self.status_bar.SetStatusText("Data not loaded.")
+        if cube is None: return self.status_bar.SetStatusText("Data not loaded.")
+        if df is None and config['type'] == 'scatter': return self.status_bar.SetStatusText("Scatter plot needs the full frame; this file was streamed.")
+        if not view_cube.row_count: return self.status_bar.SetStatusText("No diamonds match the active filter.")
+        self._redraw = lambda: self._update_plot(config)
+        key, message = self._plot_key(config['title']), f"{config['title']} Generated."
+        if self._show_cached_plot(key, message): return
         self._cleanup_plot_area()
 
-        fig, ax = plt.subplots(figsize=(6, 4), dpi=100)
-
-        if config['type'] == 'scatter':
-            sns.scatterplot(x=config['x'], y=config['y'], hue=config['hue'], data=df, ax=ax, alpha=0.6, s=10)
-            ax.set(xlabel=f"{config['x'].capitalize()} Weight", ylabel=f"{config['y'].capitalize()} ($)")
-        elif config['type'] == 'bar':
-            sns.barplot(x=config['x'], y=config['y'], data=df, ax=ax, order=config['order'], palette='viridis')
-            ax.set(xlabel=f"{config['x'].capitalize()} Quality", ylabel=f"Average {config['y'].capitalize()} ($)")
-
-        ax.set_title(config['title'])
-        fig.tight_layout()
-        
-        canvas = FigureCanvasWxAgg(self.right_panel, -1, fig)
-        self.right_sizer.Add(canvas, 1, wx.EXPAND | wx.ALL, 5)
-        self.current_plot_widget = canvas
-        self.right_sizer.Layout()
-        self.status_bar.SetStatusText(f"{config['title']} Generated.")
+        import matplotlib.pyplot as plt
+        from analysis import draw_plot
+        fig = plt.figure(figsize=PLOT_SIZE, dpi=100)
+        draw_plot(fig, config, view_df, view_cube)
+        self._embed_figure(fig, key, message)
 
     def _on_show_count_plots(self, event):
         """Generates and embeds four side-by-side count/distribution plots."""
-        if df is None: return self.status_bar.SetStatusText("Data not loaded.")
+        if cube is None: return self.status_bar.SetStatusText("Data not loaded.")
+        if not view_cube.row_count: return self.status_bar.SetStatusText("No diamonds match the active filter.")
+        self._redraw = lambda: self._on_show_count_plots(None)
+        key, message = self._plot_key('count_plots'), "4-Panel Categorical Count Plots Generated."
+        if self._show_cached_plot(key, message): return
         self._cleanup_plot_area()
 
-        fig, axes = plt.subplots(2, 2, figsize=(9, 7))
-        axes = axes.flatten()
-        
-        for i, item in enumerate(COUNT_PLOTS):
-            ax = axes[i]
-            if item['plot_type'] == 'count':
-                sns.countplot(x=item['col'], data=df, order=item['order'], ax=ax, palette='Blues_d')
-                ax.set_xlabel(f"{item['col'].capitalize()} Grade")
-            else: # 'hist' for depth
-                sns.histplot(x=item['col'], data=df, ax=ax, bins=25, kde=False, color='skyblue')
-                ax.set_xlabel("Depth Percentage")
-
-            ax.set_ylabel("Count of Diamonds")
-            ax.set_title(item['title'], fontsize=10)
-            
-        fig.tight_layout(pad=3.0)
+        import matplotlib.pyplot as plt
+        from analysis import draw_count_plots
+        fig = plt.figure(figsize=COUNT_PLOTS_SIZE)
+        draw_count_plots(fig, view_df, view_cube)
+        self._embed_figure(fig, key, message)
+
+    def _on_show_price_model(self, event):
+        """Shows the fitted price model's grade premiums and the residuals of the filtered rows."""
+        if cube is None: return self.status_bar.SetStatusText("Data not loaded.")
+        if not view_cube.row_count: return self.status_bar.SetStatusText("No diamonds match the active filter.")
+        self._redraw = lambda: self._on_show_price_model(None)
+        key, message = self._plot_key('price_model'), "Price Model (4 Cs) Generated."
+        if self._show_cached_plot(key, message): return
+        self._cleanup_plot_area()
 
-        canvas = FigureCanvasWxAgg(self.right_panel, -1, fig)
-        self.right_sizer.Add(canvas, 1, wx.EXPAND | wx.ALL, 5)
-        self.current_plot_widget = canvas
-        self.right_sizer.Layout()
-        self.status_bar.SetStatusText("4-Panel Categorical Count Plots Generated.")
+        import matplotlib.pyplot as plt
+        from analysis import draw_price_model
+        fig = plt.figure(figsize=MODEL_PLOT_SIZE)
+        draw_price_model(fig, cube.model, view_df)
+        self._embed_figure(fig, key, message)
+
+class CompareFrame(wx.Frame):
+    """Price by cut, color and clarity across several datasets, with each dataset's statistics.
+
+    The frames are views of the loaders' shared memory; closing the window releases it.
+    """
+    def __init__(self, parent, datasets):
+        super().__init__(parent, title=f"Compare Datasets ({len(datasets)})", size=(1100, 800))
+        self.datasets = datasets
+        self.canvas = None
+
+        panel = wx.Panel(self)
+        panel.SetBackgroundColour(LIGHT_BLUE)
+        sizer = wx.BoxSizer(wx.HORIZONTAL)
+
+        stats_area = wx.ScrolledWindow(panel)
+        stats_area.SetBackgroundColour(LIGHT_BLUE)
+        stats_area.SetScrollRate(0, 10)
+        stats_sizer = wx.BoxSizer(wx.VERTICAL)
+        for dataset in datasets:
+            title = wx.StaticText(stats_area, label=f"{dataset.name} ({dataset.cube.row_count:,} diamonds, {dataset.source})")
+            title.SetFont(wx.Font(10, wx.FONTFAMILY_DEFAULT, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_BOLD))
+            stats_sizer.Add(title, 0, wx.LEFT | wx.TOP, 5)
+            stats_sizer.Add(create_stats_list(stats_area, dataset.cube.describe(STAT_COLUMNS)), 0, wx.EXPAND | wx.ALL, 5)
+
+        open_row = wx.BoxSizer(wx.HORIZONTAL)
+        self.open_choice = wx.Choice(stats_area, choices=[dataset.name for dataset in datasets])
+        self.open_choice.SetSelection(0)
+        open_row.Add(self.open_choice, 1, wx.RIGHT, 5)
+        open_btn = wx.Button(stats_area, label="Open in Main Window")
+        open_btn.Bind(wx.EVT_BUTTON, self._on_open_in_main)
+        open_row.Add(open_btn, 0)
+        stats_sizer.Add(open_row, 0, wx.EXPAND | wx.ALL, 5)
+        stats_area.SetSizer(stats_sizer)
+        sizer.Add(stats_area, 0, wx.EXPAND | wx.ALL, 5)
+
+        self.plot_panel = wx.Panel(panel)
+        self.plot_sizer = wx.BoxSizer(wx.VERTICAL)
+        self.plot_panel.SetSizer(self.plot_sizer)
+        sizer.Add(self.plot_panel, 1, wx.EXPAND | wx.ALL, 5)
+        panel.SetSizer(sizer)
+
+        self._draw()
+        self.Bind(wx.EVT_WINDOW_DESTROY, self._on_destroy)
+
+    def _draw(self):
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_wxagg import FigureCanvasWxAgg
+        from analysis import draw_comparison
+        fig = plt.figure(figsize=COMPARE_PLOTS_SIZE)
+        draw_comparison(fig, [dataset.cube for dataset in self.datasets], [dataset.name for dataset in self.datasets])
+        self.canvas = FigureCanvasWxAgg(self.plot_panel, -1, fig)
+        self.plot_sizer.Add(self.canvas, 1, wx.EXPAND)
+        self.plot_panel.Layout()
+
+    def _on_open_in_main(self, event):
+        """Makes the chosen dataset the main window's data (its frame is handed over without a copy)."""
+        dataset = self.datasets[self.open_choice.GetSelection()]
+        self.GetParent().loader.adopt(dataset.frame, dataset.cube, dataset.initial_rows, f"{dataset.name} (comparison)")
+
+    def _on_destroy(self, event):
+        event.Skip()
+        if event.GetEventObject() is not self:
+            return
+        if self.canvas is not None:
+            import matplotlib.pyplot as plt
+            plt.close(self.canvas.figure)
+        for dataset in self.datasets:
+            dataset.release() # The block outlives this call while the main window still views it
+        self.datasets = []
 
 class DiamondApp(wx.App):
     def OnInit(self):
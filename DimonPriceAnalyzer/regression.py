@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+# --- Constants & Configuration ---
+BATCH_ROWS = 250_000   # Rows turned into a design matrix at a time while accumulating
+
+
+class PriceModel:
+    """Least-squares fit of log(price) on log(carat) plus one-hot cut/color/clarity grades.
+
+    Only the normal equations (X'X, X'y, y'y, n) are kept, so rows can be
+    added batch by batch, or from another model with merge(), and fit()
+    re-solves the small system without revisiting any row. The first grade
+    of each column is the reference level; rows with a missing grade or a
+    non-positive carat/price are skipped.
+    """
+
+    def __init__(self, cat_orders):
+        self.cat_orders = dict(cat_orders)
+        self.terms = ['intercept', 'log_carat'] + [f"{col}={name}" for col, order in self.cat_orders.items()
+                                                   for name in order[1:]]
+        self.offsets = {}
+        offset = 2
+        for col, order in self.cat_orders.items():
+            self.offsets[col] = offset - 1 # Code 0 (reference) maps to no column
+            offset += len(order) - 1
+        size = len(self.terms)
+        self.xtx = np.zeros((size, size))
+        self.xty = np.zeros(size)
+        self.yty = 0.0
+        self.n = 0
+        self.coef = None
+        self.sigma2 = np.nan
+
+    @classmethod
+    def build(cls, frame, cat_orders):
+        model = cls(cat_orders)
+        model.add_frame(frame)
+        return model.fit()
+
+    def add_frame(self, frame):
+        self.add_arrays(frame['carat'].to_numpy(), frame['price'].to_numpy(),
+                        {col: frame[col].cat.codes.to_numpy() for col in self.cat_orders})
+
+    def add_arrays(self, carat, price, codes):
+        """Accumulates rows into the normal equations, BATCH_ROWS at a time."""
+        for start in range(0, len(carat), BATCH_ROWS):
+            batch = slice(start, start + BATCH_ROWS)
+            x, y = self._design(carat[batch], {col: c[batch] for col, c in codes.items()}, price[batch])
+            self.xtx += x.T @ x
+            self.xty += x.T @ y
+            self.yty += y @ y
+            self.n += len(y)
+        self.coef = None
+
+    def _design(self, carat, codes, price):
+        carat, price = np.asarray(carat, dtype=float), np.asarray(price, dtype=float)
+        valid = (carat > 0) & (price > 0)
+        for col in self.cat_orders:
+            valid &= codes[col] >= 0
+        rows = int(valid.sum())
+
+        x = np.zeros((rows, len(self.terms)))
+        x[:, 0] = 1.0
+        x[:, 1] = np.log(carat[valid])
+        index = np.arange(rows)
+        for col, offset in self.offsets.items():
+            c = codes[col][valid].astype(np.intp)
+            hot = c > 0
+            x[index[hot], offset + c[hot]] = 1.0
+        return x, np.log(price[valid])
+
+    def merge(self, other):
+        self.xtx += other.xtx
+        self.xty += other.xty
+        self.yty += other.yty
+        self.n += other.n
+        self.coef = None
+        return self
+
+    def fit(self):
+        """Solves the normal equations; grades with no rows get a zero coefficient."""
+        seen = np.diag(self.xtx) > 0
+        coef = np.zeros(len(self.terms))
+        coef[seen] = np.linalg.lstsq(self.xtx[np.ix_(seen, seen)], self.xty[seen], rcond=None)[0]
+        self.coef = coef
+        rss = self.yty - 2 * coef @ self.xty + coef @ self.xtx @ coef
+        self.sigma2 = max(rss, 0.0) / (self.n - seen.sum()) if self.n > seen.sum() else np.nan
+        return self
+
+    # --- Queries ---
+
+    def r_squared(self):
+        """Share of log(price) variance explained."""
+        if not self.n:
+            return np.nan
+        mean = self.xty[0] / self.n
+        tss = self.yty - self.n * mean * mean
+        rss = self.sigma2 * (self.n - np.count_nonzero(np.diag(self.xtx)))
+        return 1 - rss / tss if tss > 0 else np.nan
+
+    def coefficients(self):
+        """Fitted terms with their price multiplier (exp(coef)) and standard error."""
+        seen = np.diag(self.xtx) > 0
+        se = np.full(len(self.terms), np.nan)
+        if seen.any() and not np.isnan(self.sigma2):
+            se[seen] = np.sqrt(np.diag(np.linalg.pinv(self.xtx[np.ix_(seen, seen)])) * self.sigma2)
+        return pd.DataFrame({'coef': self.coef, 'multiplier': np.exp(self.coef), 'std_err': se},
+                            index=pd.Index(self.terms, name='term'))
+
+    def predict_log(self, carat, codes):
+        """log(price) for any number of stones, from lookup tables rather than a design matrix."""
+        log_price = self.coef[0] + self.coef[1] * np.log(np.asarray(carat, dtype=float))
+        for col, offset in self.offsets.items():
+            table = np.concatenate([[0.0], self.coef[offset + 1:offset + len(self.cat_orders[col])], [np.nan]])
+            log_price += table[codes[col]] # Code -1 (missing grade) indexes the trailing NaN
+        return log_price
+
+    def predict(self, carat, codes):
+        """Expected price in dollars (log-normal mean, so exp(sigma^2 / 2) is applied)."""
+        return np.exp(self.predict_log(carat, codes) + self.sigma2 / 2)
+
+    def predict_frame(self, frame):
+        return self.predict(frame['carat'].to_numpy(), {col: frame[col].cat.codes.to_numpy() for col in self.cat_orders})
+
+    def residuals(self, frame):
+        """log(price) minus the fitted log(price), per row of `frame`."""
+        codes = {col: frame[col].cat.codes.to_numpy() for col in self.cat_orders}
+        return np.log(frame['price'].to_numpy(dtype=float)) - self.predict_log(frame['carat'].to_numpy(), codes)
@@ -0,0 +1,116 @@
+"""Headless batch report: renders every analyzer plot for one or more CSVs.
+
+Usage: python report.py diamonds.csv [more.csv ...] -o reports --workers 4
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+
+from analysis import (PLOTS, COUNT_PLOTS_SIZE, PLOT_SIZE, MODEL_PLOT_SIZE, STAT_COLUMNS, load_dataset, draw_plot,
+                      draw_count_plots, draw_price_model)
+
+REPORT_PLOTS = [*PLOTS, 'count_plots', 'price_model']
+
+# --- Worker Tasks ---
+
+def _summarize(path):
+    """Loads one CSV (warming its frame cache) and returns its get_stats table.
+
+    A streamed file's cube is returned too, so the render tasks reuse it instead of streaming the CSV again.
+    """
+    start = time.perf_counter()
+    df, cube, initial_rows, source = load_dataset(path)
+    stats = cube.describe(STAT_COLUMNS)
+    model = cube.model.coefficients()
+    return {'path': path, 'initial_rows': initial_rows, 'cleaned_rows': cube.row_count, 'source': source,
+            'load_s': time.perf_counter() - start, 'stats': stats.to_dict(orient='index'),
+            'price_model': {'r_squared': cube.model.r_squared(), 'coef': model['coef'].to_dict()},
+            'cube': cube if df is None else None}
+
+def _render(path, name, out_path, cube=None):
+    """Renders one plot of one CSV to a PNG and returns its timings; a given (streamed) cube skips the load."""
+    start = time.perf_counter()
+    df = None
+    if cube is None:
+        df, cube, _, _ = load_dataset(path)
+    loaded = time.perf_counter()
+
+    if name == 'count_plots':
+        fig = Figure(figsize=COUNT_PLOTS_SIZE)
+        draw_count_plots(fig, df, cube)
+    elif name == 'price_model':
+        fig = Figure(figsize=MODEL_PLOT_SIZE)
+        draw_price_model(fig, cube.model, df)
+    else:
+        fig = Figure(figsize=PLOT_SIZE, dpi=100)
+        draw_plot(fig, PLOTS[name], df, cube)
+    drawn = time.perf_counter()
+
+    fig.savefig(out_path)
+    saved = time.perf_counter()
+    return {'path': path, 'plot': name, 'png': out_path,
+            'load_s': loaded - start, 'draw_s': drawn - loaded, 'save_s': saved - drawn, 'total_s': saved - start}
+
+# --- Report ---
+
+def _out_dir(out, path):
+    """Per-CSV output folder named after the file."""
+    return os.path.join(out, os.path.splitext(os.path.basename(path))[0])
+
+def run(paths, out, workers=None):
+    """Loads every CSV, renders all plots in a process pool and writes summary.json/summary.csv."""
+    paths = list(dict.fromkeys(paths))
+    os.makedirs(out, exist_ok=True)
+    results = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Load each file once first so the render tasks all hit the warm frame cache
+        for summary in pool.map(_summarize, paths):
+            summary['plots'] = {}
+            results[summary['path']] = summary
+        streamed = {path: results[path].pop('cube') for path in paths}
+
+        tasks = []
+        for path in paths:
+            os.makedirs(_out_dir(out, path), exist_ok=True)
+            for name in REPORT_PLOTS:
+                if results[path]['source'] == 'stream' and PLOTS.get(name, {}).get('type') == 'scatter':
+                    continue # Streamed files keep no rows to scatter
+                tasks.append(pool.submit(_render, path, name, os.path.join(_out_dir(out, path), f"{name}.png"),
+                                         streamed[path]))
+        for task in as_completed(tasks):
+            timing = task.result()
+            results[timing['path']]['plots'][timing['plot']] = timing
+            print(f"{timing['path']} {timing['plot']:<12} draw {timing['draw_s']:.3f}s  save {timing['save_s']:.3f}s  total {timing['total_s']:.3f}s")
+
+    with open(os.path.join(out, 'summary.json'), 'w') as f:
+        json.dump(list(results.values()), f, indent=2)
+
+    with open(os.path.join(out, 'summary.csv'), 'w', newline='') as f:
+        writer = None
+        for summary in results.values():
+            for measure, stats in summary['stats'].items():
+                row = {'path': summary['path'], 'rows': summary['cleaned_rows'], 'measure': measure, **stats}
+                if writer is None:
+                    writer = csv.DictWriter(f, fieldnames=list(row))
+                    writer.writeheader()
+                writer.writerow(row)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render Diamond Price Analyzer plots and stats without a display.")
+    parser.add_argument('csv', nargs='+', help="diamond CSV files to report on")
+    parser.add_argument('-o', '--out', default='reports', help="output directory (default: reports)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="process pool size (default: CPU count)")
+    args = parser.parse_args(argv)
+    run(args.csv, args.out, args.workers)
+
+if __name__ == '__main__':
+    main()
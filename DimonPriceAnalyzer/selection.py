@@ -0,0 +1,73 @@
+import numpy as np
+
+from config import RANGE_COLUMNS
+
+
+class SelectionIndex:
+    """Precomputed indexes for filtering a frame without scanning every row.
+
+    Each category code of the ordered categorical columns gets a packed
+    bitmap (one bit per row), and every RANGE_COLUMNS column gets a sorted
+    copy plus the row order that sorts it. A selection ORs the bitmaps of the
+    chosen codes per column, ANDs the columns together and binary-searches
+    the sorted columns for ranges.
+    """
+
+    def __init__(self, frame, cat_orders, range_columns=RANGE_COLUMNS):
+        self.rows = len(frame)
+        self.cat_orders = dict(cat_orders)
+        self.bitmaps = {}
+        for col in self.cat_orders:
+            codes = frame[col].cat.codes.to_numpy()
+            self.bitmaps[col] = [np.packbits(codes == code) for code in range(len(self.cat_orders[col]))]
+        self.sorted = {}
+        for col in range_columns:
+            values = frame[col].to_numpy()
+            order = np.argsort(values, kind='stable')
+            self.sorted[col] = (values[order], order)
+
+    def _range_bitmap(self, col, low, high):
+        values, order = self.sorted[col]
+        integer = values.dtype.kind in 'iu'
+        limits = np.iinfo(values.dtype) if integer else np.finfo(values.dtype)
+        lowest, highest = (int(limits.min), int(limits.max)) if integer else (float(limits.min), float(limits.max))
+        # NaN rows sort last and never match a range
+        start, stop = 0, len(values) if integer else np.searchsorted(values, values.dtype.type(np.nan), side='left')
+        # Bounds are clipped to the dtype's range, then cast to it: a float64 1.01 is above the float32 1.01
+        # stored for the stone, and an out-of-range bound would wrap around
+        if low is not None:
+            low = np.ceil(low) if integer else low
+            start = stop if low > highest else np.searchsorted(values, values.dtype.type(max(low, lowest)), side='left')
+        if high is not None:
+            high = np.floor(high) if integer else high
+            stop = start if high < lowest else np.searchsorted(values, values.dtype.type(min(high, highest)), side='right')
+        hits = np.zeros(self.rows, dtype=bool)
+        hits[order[start:max(start, stop)]] = True
+        return np.packbits(hits)
+
+    def select(self, filters):
+        """Row positions matching `filters`, or None when nothing is filtered.
+
+        `filters` maps a categorical column to the category names to keep and a
+        range column to an inclusive (low, high) pair where either end may be None;
+        a NaN or infinite bound raises ValueError.
+        """
+        result = None
+        for col, wanted in filters.items():
+            if col in self.bitmaps:
+                if len(wanted) == len(self.cat_orders[col]):
+                    continue # Every category ticked: no restriction
+                bits = np.zeros((self.rows + 7) // 8, dtype=np.uint8)
+                for name in wanted:
+                    np.bitwise_or(bits, self.bitmaps[col][self.cat_orders[col].index(name)], out=bits)
+            else:
+                low, high = wanted
+                if any(bound is not None and not np.isfinite(bound) for bound in wanted):
+                    raise ValueError(f"Range bounds for {col} must be finite numbers.")
+                if low is None and high is None:
+                    continue
+                bits = self._range_bitmap(col, low, high)
+            result = bits if result is None else np.bitwise_and(result, bits, out=result)
+        if result is None:
+            return None
+        return np.flatnonzero(np.unpackbits(result, count=self.rows))
@@ -0,0 +1,70 @@
+"""Startup profiling for `python main.py --profile-startup`.
+
+install() wraps the import machinery to time every module loaded from
+then on; mark() records milestones such as the first window or the data
+becoming usable; report() prints both. All of it is a no-op unless
+install() was called.
+"""
+import builtins
+import sys
+import threading
+import time
+
+# --- Constants & Configuration ---
+TOP_MODULES = 15   # Rows in each table of the report
+
+_start = time.perf_counter()
+_active = False
+_original_import = builtins.__import__
+_local = threading.local()
+_imports = {}      # module -> [cumulative_s, self_s, thread name]
+_marks = {}        # milestone -> seconds since main.py started
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    key = name
+    if level:
+        base = ((globals or {}).get('__package__') or '').rsplit('.', level - 1)[0]
+        key = f"{base}.{name}" if name else base
+    if key in sys.modules:
+        return _original_import(name, globals, locals, fromlist, level)
+
+    stack = _local.__dict__.setdefault('stack', [])
+    stack.append(0.0)           # Accumulates the time of nested imports
+    start = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - start
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        if key not in _imports:
+            _imports[key] = [elapsed, elapsed - children, threading.current_thread().name]
+
+def install():
+    global _active
+    _active = True
+    builtins.__import__ = _timed_import
+
+def mark(name):
+    """Records when a startup milestone is first reached."""
+    if _active and name not in _marks:
+        _marks[name] = time.perf_counter() - _start
+
+def report(file=None):
+    """Prints the import-time breakdown and the milestones."""
+    if not _active:
+        return
+    file = file or sys.stdout
+    top = sorted(_imports.items(), key=lambda item: -item[1][0])
+    print(f"\nSTARTUP PROFILE ({len(_imports)} modules imported, {sum(v[1] for v in _imports.values()):.3f} s of import work)",
+          file=file)
+    print(f"{'module':<40}{'cumulative':>12}{'self':>10}  thread", file=file)
+    for name, (cumulative, own, thread) in top[:TOP_MODULES]:
+        print(f"{name:<40}{cumulative:>11.3f}s{own:>9.3f}s  {thread}", file=file)
+
+    print(f"\n{'milestone':<40}{'since start':>12}", file=file)
+    for name, at in sorted(_marks.items(), key=lambda item: item[1]):
+        print(f"{name:<40}{at:>11.3f}s", file=file)
+    file.flush()
@@ -0,0 +1,134 @@
+import os
+
+import numpy as np
+
+from cube import AggregateCube, QUANTILES
+from regression import PriceModel
+
+# --- Constants & Configuration ---
+SKETCH_K = 4096                 # Items kept per sketch level; rank error is roughly 1/SKETCH_K
+HIST_RANGE = (0.0, 100.0)       # Fixed range/resolution of streamed histograms, rebinned at draw time
+HIST_BINS = 10_000
+STREAM_MEMORY_FRACTION = 0.25   # Stream once the CSV is larger than this share of available RAM
+STREAM_MIN_BYTES = 2 * 1024**3  # Fallback threshold where available RAM can't be queried
+
+
+def should_stream(path):
+    """True if the CSV is too large to load as one in-memory frame."""
+    size = os.path.getsize(path)
+    try:
+        available = os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return size > STREAM_MIN_BYTES
+    return size > available * STREAM_MEMORY_FRACTION
+
+# --- Sketches ---
+
+class QuantileSketch:
+    """Mergeable KLL-style quantile sketch.
+
+    Values enter level 0; whenever a level holds more than `k` items it is
+    sorted and every other item (random offset) is promoted to the next
+    level with double weight, so memory stays O(k log(n / k)).
+    """
+
+    def __init__(self, k=SKETCH_K, seed=None):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.n += len(values)
+        self._compress()
+
+    def merge(self, other):
+        for h, level in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self.k:
+                level = np.sort(level)
+                odd = len(level) % 2
+                promoted = level[self._rng.integers(2):len(level) - odd:2]
+                self.levels[h] = level[len(level) - odd:]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def quantiles(self, qs):
+        """Approximate values at the given quantiles (NaN while empty)."""
+        if not self.n:
+            return np.full(len(qs), np.nan)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        cum = np.cumsum(weights[order])
+        idx = np.searchsorted(cum, np.asarray(qs) * cum[-1], side='left')
+        return values[order][np.minimum(idx, len(values) - 1)]
+
+
+def coarse_histogram(counts, edges, bins=25):
+    """Rebins a fine fixed-range histogram into `bins` equal bins over its occupied range."""
+    occupied = np.flatnonzero(counts)
+    if not len(occupied):
+        return np.zeros(bins), np.linspace(*HIST_RANGE, bins + 1)
+    lo, hi = edges[occupied[0]], edges[occupied[-1] + 1]
+    coarse_edges = np.linspace(lo, hi, bins + 1)
+    centers = (edges[:-1] + edges[1:]) / 2
+    idx = np.clip(np.searchsorted(coarse_edges, centers, side='right') - 1, 0, bins - 1)
+    return np.bincount(idx, weights=counts, minlength=bins), coarse_edges
+
+# --- Streaming Summary ---
+
+class StreamingStats:
+    """Bounded-memory summary of a chunked read: aggregate cube, quantile sketches, histograms and price model."""
+
+    def __init__(self, cat_orders, hist_columns=()):
+        self.cube = AggregateCube(cat_orders)
+        self.model = PriceModel(cat_orders)
+        self.sketches = {m: QuantileSketch() for m in self.cube.measures}
+        self.edges = np.linspace(*HIST_RANGE, HIST_BINS + 1)
+        self.histograms = {col: np.zeros(HIST_BINS, dtype=np.int64) for col in hist_columns}
+
+    def add(self, chunk):
+        """Folds one cleaned, categorized chunk into the summary."""
+        self.cube.add_arrays({dim: chunk[dim].cat.codes.to_numpy() for dim in self.cube.dims},
+                             {m: chunk[m].to_numpy() for m in self.cube.measures})
+        self.model.add_frame(chunk)
+        for m, sketch in self.sketches.items():
+            sketch.update(chunk[m].to_numpy())
+        for col, counts in self.histograms.items():
+            values = chunk[col].to_numpy(dtype=float)
+            values = values[~np.isnan(values)]
+            idx = ((values - HIST_RANGE[0]) * (HIST_BINS / (HIST_RANGE[1] - HIST_RANGE[0]))).astype(np.intp)
+            counts += np.bincount(np.clip(idx, 0, HIST_BINS - 1), minlength=HIST_BINS)
+
+    def merge(self, other):
+        """Combines a summary of other chunks (e.g. from another worker) into this one."""
+        self.cube.merge(other.cube)
+        self.model.merge(other.model)
+        for m, sketch in self.sketches.items():
+            sketch.merge(other.sketches[m])
+        for col, counts in self.histograms.items():
+            counts += other.histograms[col]
+        return self
+
+    def finish(self):
+        """Returns the cube with sketch quantiles, coarse histograms and the fitted price model attached."""
+        self.cube.model = self.model.fit()
+        self.cube.quantiles = {m: sketch.quantiles(QUANTILES) for m, sketch in self.sketches.items()}
+        self.cube.histograms = {col: coarse_histogram(counts, self.edges) for col, counts in self.histograms.items()}
+        return self.cube
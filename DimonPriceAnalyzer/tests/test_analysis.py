@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+import frame_cache
+from analysis import append_dataset, load_dataset
+from config import CAT_ORDERS
+
+HEADER = '"","carat","cut","color","clarity","depth","table","price","x","y","z"\n'
+ROWS = [
+    '"1",0.23,"Ideal","E","SI2",61.5,55,326,3.95,3.98,2.43\n',
+    '"2",0.21,"Premium","E","SI1",59.8,61,,3.89,3.84,2.31\n',
+    '"3",0.23,"Good","E","VS1",56.9,65,327,4.05,4.07,2.31\n',
+    '"4",0.29,"Premium","I","VS2",62.4,58,334,0,4.23,2.63\n',
+]
+
+
+def test_missing_price_loads_as_nan(tmp_path):
+    path = tmp_path / "diamonds.csv"
+    path.write_text(HEADER + "".join(ROWS))
+    frame, cube, initial_rows, _ = load_dataset(str(path))
+
+    assert initial_rows == 4
+    assert len(frame) == cube.row_count == 3 # The zero-dimension stone is dropped, the unpriced one kept
+    assert np.isnan(frame['price'].iloc[1])
+    assert cube.describe(['price']).loc['price', 'count'] == 2
+    assert cube.describe(['price']).loc['price', 'mean'] == 326.5
+
+
+def test_partial_last_line_waits_for_append(tmp_path, monkeypatch):
+    path = tmp_path / "diamonds.csv"
+    loaded = HEADER + ROWS[0] + ROWS[2]
+    path.write_text(loaded + ROWS[1][:20])
+    frame, cube, initial_rows, source = load_dataset(str(path))
+    assert (initial_rows, source, len(frame)) == (2, "CSV", 2)
+    assert cube.extent['offset'] == len(loaded)
+
+    hashed_from = []
+    file_digest = frame_cache.file_digest
+    monkeypatch.setattr(frame_cache, 'file_digest',
+                        lambda *args, start=0, **kwargs: hashed_from.append(start) or file_digest(*args, start=start, **kwargs))
+    with open(path, 'a') as f:
+        f.write(ROWS[1][20:] + ROWS[3] + ROWS[0][:5])
+    frame, cube, initial_rows, source = append_dataset(str(path), frame, cube)
+    assert (initial_rows, source, len(frame)) == (4, "appended rows (+2)", 3)
+    assert hashed_from == [len(loaded) + 20] # Only the bytes appended since the signature was taken
+    monkeypatch.undo()
+
+    # The new row is cached as a second part, and the chained signature matches the grown file
+    cached, meta = frame_cache.load(str(path), CAT_ORDERS)
+    assert meta['parts'] == [2, 1]
+    pd.testing.assert_frame_equal(cached.reset_index(drop=True), frame.reset_index(drop=True))
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import CAT_ORDERS, STAT_COLUMNS
+from cube import AggregateCube
+
+
+@pytest.fixture(scope="module")
+def frame():
+    rng = np.random.default_rng(1)
+    rows = 20_000
+    data = {col: pd.Categorical(rng.choice(order + [None], rows), categories=order, ordered=True)
+            for col, order in CAT_ORDERS.items()}
+    data['carat'] = rng.lognormal(-0.45, 0.58, rows).astype('float32')
+    data['price'] = rng.integers(326, 18_823, rows).astype('int32')
+    return pd.DataFrame(data)
+
+
+def test_describe_matches_pandas(frame):
+    expected = frame[STAT_COLUMNS].describe().T
+    actual = AggregateCube.build(frame, CAT_ORDERS).describe(STAT_COLUMNS)
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, rtol=1e-6)
+
+
+@pytest.mark.parametrize("dim", list(CAT_ORDERS))
+def test_marginal_matches_groupby(frame, dim):
+    expected = frame.groupby(dim, observed=False)['price'].agg(['count', 'mean', 'std', 'min', 'max'])
+    expected.index = pd.Index(CAT_ORDERS[dim], name=dim) # The cube labels categories with a plain index
+    actual = AggregateCube.build(frame, CAT_ORDERS).marginal(dim, 'price')
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, rtol=1e-6)
+
+
+def test_merge_equals_single_build(frame):
+    half = len(frame) // 2
+    merged = AggregateCube.build(frame.iloc[:half], CAT_ORDERS).merge(AggregateCube.build(frame.iloc[half:], CAT_ORDERS))
+    whole = AggregateCube.build(frame, CAT_ORDERS)
+    assert merged.row_count == whole.row_count == len(frame)
+    for m in whole.measures:
+        for key, values in whole.stats[m].items():
+            np.testing.assert_allclose(merged.stats[m][key], values)
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis import COLUMN_DTYPES
+from config import CAT_ORDERS
+from selection import SelectionIndex
+
+
+@pytest.fixture(scope="module")
+def frame():
+    rng = np.random.default_rng(0)
+    rows = 5_000
+    data = {'carat': rng.choice([0.3, 0.31, 1.0, 1.01, 1.5, 2.02], rows), 'price': rng.integers(326, 19_000, rows)}
+    for col, order in CAT_ORDERS.items():
+        data[col] = rng.choice(order, rows)
+    frame = pd.DataFrame(data).astype({col: COLUMN_DTYPES[col] for col in data})
+    frame.loc[::97, 'price'] = np.nan # Empty price cells
+    return frame
+
+
+def _mask(frame, filters):
+    mask = np.ones(len(frame), dtype=bool)
+    for col, wanted in filters.items():
+        if col in CAT_ORDERS:
+            mask &= frame[col].isin(wanted).to_numpy()
+        else:
+            low, high = wanted
+            values = frame[col].astype(float).round(6) # The decimal the CSV held
+            if low is not None:
+                mask &= (values >= low).to_numpy()
+            if high is not None:
+                mask &= (values <= high).to_numpy()
+    return np.flatnonzero(mask)
+
+
+@pytest.mark.parametrize("filters", [
+    {'carat': (1.01, 1.5)},
+    {'carat': (0.3, 0.3)},
+    {'carat': (None, 0.3)},
+    {'carat': (0.31, None), 'price': (1000.5, 5000)},
+    {'cut': ['Ideal', 'Fair'], 'color': ['D'], 'carat': (1.0, 2.02)},
+    {'clarity': []},
+    {'price': (None, 3e9)},
+    {'price': (1000, 1e10)},
+    {'price': (-1e40, 500)},
+    {'carat': (2.5, 1.0)},
+])
+def test_select_matches_boolean_mask(frame, filters):
+    rows = SelectionIndex(frame, CAT_ORDERS).select(filters)
+    np.testing.assert_array_equal(rows, _mask(frame, filters))
+
+
+def test_select_without_restrictions_is_none(frame):
+    filters = {**{col: list(order) for col, order in CAT_ORDERS.items()}, 'carat': (None, None)}
+    assert SelectionIndex(frame, CAT_ORDERS).select(filters) is None
+
+
+@pytest.mark.parametrize("bounds", [(None, 3e9), (1000, 1e10), (-5e9, 400), (3e9, None), (None, -3e9)])
+def test_out_of_range_bounds_on_integer_column(frame, bounds):
+    ints = frame.assign(price=frame['price'].fillna(0).astype('int32'))
+    filters = {'price': bounds}
+    np.testing.assert_array_equal(SelectionIndex(ints, CAT_ORDERS).select(filters), _mask(ints, filters))
+
+
+@pytest.mark.parametrize("bounds", [(float('nan'), None), (None, float('inf'))])
+def test_non_finite_bounds_are_rejected(frame, bounds):
+    with pytest.raises(ValueError):
+        SelectionIndex(frame, CAT_ORDERS).select({'carat': bounds})
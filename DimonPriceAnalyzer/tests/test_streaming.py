@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from config import CAT_ORDERS
+from cube import AggregateCube
+from streaming import QuantileSketch, StreamingStats
+
+QS = np.array([0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99])
+RANK_TOLERANCE = 0.01
+
+
+def _rank_error(values, estimates):
+    ordered = np.sort(values)
+    return np.abs(np.searchsorted(ordered, estimates) / len(ordered) - QS).max()
+
+
+def test_sketch_quantiles_within_rank_tolerance():
+    values = np.random.default_rng(2).lognormal(8, 1, 500_000)
+    sketch = QuantileSketch(seed=0)
+    for chunk in np.array_split(values, 37):
+        sketch.update(chunk)
+    assert sketch.n == len(values)
+    assert _rank_error(values, sketch.quantiles(QS)) < RANK_TOLERANCE
+
+
+def test_merged_sketches_match_the_whole():
+    values = np.random.default_rng(3).normal(0, 1, 200_000)
+    left, right = QuantileSketch(seed=1), QuantileSketch(seed=2)
+    left.update(values[:120_000])
+    right.update(values[120_000:])
+    merged = left.merge(right)
+    assert merged.n == len(values)
+    assert _rank_error(values, merged.quantiles(QS)) < RANK_TOLERANCE
+
+
+def test_streamed_cube_matches_built_cube():
+    rng = np.random.default_rng(4)
+    rows = 30_000
+    frame = pd.DataFrame({col: pd.Categorical(rng.choice(order, rows), categories=order, ordered=True)
+                          for col, order in CAT_ORDERS.items()})
+    frame['carat'] = rng.uniform(0.2, 3, rows)
+    frame['price'] = rng.integers(326, 18_823, rows)
+    frame['depth'] = rng.normal(61.75, 1.43, rows)
+
+    summary = StreamingStats(CAT_ORDERS, ['depth'])
+    for start in range(0, rows, 7_000):
+        summary.add(frame.iloc[start:start + 7_000])
+    streamed, built = summary.finish(), AggregateCube.build(frame, CAT_ORDERS)
+
+    np.testing.assert_array_equal(streamed.rows, built.rows)
+    np.testing.assert_allclose(streamed.stats['price']['sum'], built.stats['price']['sum'])
+    assert streamed.histograms['depth'][0].sum() == rows
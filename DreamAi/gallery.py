@@ -0,0 +1,129 @@
+import time
+import tkinter
+from collections import OrderedDict
+
+import customtkinter
+from PIL import Image, ImageTk
+
+from history import GALLERY_THUMB
+from scheduler import JobScheduler
+
+# --- Gallery Configuration ---
+ROW_HEIGHT = 76
+GALLERY_WIDTH = 260
+THUMB_CACHE_SIZE = 256   # PhotoImages kept for rows scrolled out of view
+LOADER_THREADS = 2
+
+
+class HistoryGallery(customtkinter.CTkFrame):
+    """Virtual scrolling list of past generations.
+
+    Only the rows inside the viewport are drawn, and their thumbnails are
+    decoded on a background thread, so scrolling cost does not depend on
+    how many generations the history holds.
+    """
+
+    def __init__(self, master, store, on_select, **kwargs):
+        super().__init__(master, width=GALLERY_WIDTH, fg_color="#151515", corner_radius=0, **kwargs)
+        self.store = store
+        self.on_select = on_select
+        self.total = 0
+        self.visible_rows = {}                      # row index -> history row
+        self.photos = OrderedDict()                 # history id -> PhotoImage (LRU)
+        self.requested = set()
+        self.loader = JobScheduler(self, LOADER_THREADS)  # Separate from generation jobs so loads never queue behind them
+
+        self.canvas = tkinter.Canvas(self, width=GALLERY_WIDTH - 16, bg="#151515", highlightthickness=0,
+                                     yscrollincrement=ROW_HEIGHT // 2)
+        self.scrollbar = customtkinter.CTkScrollbar(self, command=self._on_scrollbar)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.canvas.bind("<Configure>", lambda event: self.redraw())
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda event: self._scroll_units(-1))
+        self.canvas.bind("<Button-5>", lambda event: self._scroll_units(1))
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.refresh()
+
+    # --- Background loading ---
+
+    def load_async(self, work, callback):
+        """Runs `work()` on a loader thread and `callback(result)` back on the UI thread."""
+        def done(result, error):
+            if error is not None:
+                print(f"Gallery load failed: {error}")
+            callback(None if error else result)
+
+        self.loader.submit(work, on_done=done)
+
+    def _load_thumb(self, row):
+        with Image.open(row["thumb_path"]) as image:
+            image.load()
+            return image
+
+    def _thumb_loaded(self, row_id, image):
+        self.requested.discard(row_id)
+        if image is None:
+            return
+        self.photos[row_id] = ImageTk.PhotoImage(image)
+        while len(self.photos) > THUMB_CACHE_SIZE:
+            self.photos.popitem(last=False)
+        self.redraw()
+
+    # --- Drawing ---
+
+    def refresh(self):
+        """Re-reads the row count (call after a new generation is recorded)."""
+        self.total = self.store.count()
+        self.canvas.configure(scrollregion=(0, 0, GALLERY_WIDTH, self.total * ROW_HEIGHT))
+        self.redraw()
+
+    def redraw(self):
+        """Draws only the rows intersecting the viewport."""
+        self.canvas.delete("row")
+        top = self.canvas.canvasy(0)
+        first = max(int(top // ROW_HEIGHT), 0)
+        count = int(self.canvas.winfo_height() // ROW_HEIGHT) + 2
+        rows = self.store.page(first, count) if self.total else []
+        self.visible_rows = {first + i: row for i, row in enumerate(rows)}
+
+        for index, row in self.visible_rows.items():
+            y = index * ROW_HEIGHT
+            photo = self.photos.get(row["id"])
+            if photo is not None:
+                self.photos.move_to_end(row["id"])
+                self.canvas.create_image(6, y + 6, image=photo, anchor="nw", tags="row")
+            else:
+                self.canvas.create_rectangle(6, y + 6, 6 + GALLERY_THUMB[0], y + 6 + GALLERY_THUMB[1],
+                                             fill="#202020", outline="", tags="row")
+                if row["id"] not in self.requested:
+                    self.requested.add(row["id"])
+                    self.load_async(lambda row=row: self._load_thumb(row),
+                                    lambda image, row_id=row["id"]: self._thumb_loaded(row_id, image))
+
+            text_x = GALLERY_THUMB[0] + 14
+            self.canvas.create_text(text_x, y + 8, text=row["prompt"][:60], anchor="nw", fill="white",
+                                    width=GALLERY_WIDTH - text_x - 22, font=("Segoe UI", 9), tags="row")
+            when = time.strftime("%d %b %H:%M", time.localtime(row["created_at"]))
+            self.canvas.create_text(text_x, y + ROW_HEIGHT - 20, text=f"{when}  ·  {row['latency_s']:.1f}s",
+                                    anchor="nw", fill="#888888", font=("Segoe UI", 8), tags="row")
+
+    # --- Events ---
+
+    def _on_scrollbar(self, *args):
+        self.canvas.yview(*args)
+        self.redraw()
+
+    def _scroll_units(self, units):
+        self.canvas.yview_scroll(units, "units")
+        self.redraw()
+
+    def _on_wheel(self, event):
+        self._scroll_units(-1 if event.delta > 0 else 1)
+
+    def _on_click(self, event):
+        row = self.visible_rows.get(int(self.canvas.canvasy(event.y) // ROW_HEIGHT))
+        if row is not None:
+            self.on_select(row)
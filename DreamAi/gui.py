@@ -1,81 +1,177 @@
 import customtkinter
 from PIL import Image
-import threading
+import asyncio
+import random
+import time
 import image_api 
-import shutil    
-import os  
+import metrics
+from image_cache import cache, make_thumbnail
+from history import history
+from gallery import HistoryGallery, GALLERY_WIDTH
+from scheduler import JobScheduler
 from tkinter import filedialog 
 
+# --- Batch Configuration ---
+MAX_CONCURRENCY = 4          # Generations in flight at once
+NUM_STEPS = 8
+GRID_COLUMNS = 3
+GRID_THUMB = (180, 210)
+
+RESULT_SIZE = (360, 420)
+STARTUP_IMAGE = "./images/flux_output.png"  # Shown in the result view until the first generation
+latest_image = None            # PNG bytes of the image in the main result view
+
 app = customtkinter.CTk()
+scheduler = JobScheduler(app, MAX_CONCURRENCY)
+metrics.serve_from_env()       # Prometheus-style /metrics when DREAMAI_METRICS_PORT is set
 
 app.geometry("720x420")
 app.resizable(False, False)
 app.configure(fg_color="#000000")
 app.title("DreamAi")
 
-def run_api_in_background(prompt):
-    """This function runs inside the thread (The Chef)"""
+def run_api_in_background(prompt, seed=None, size=RESULT_SIZE, progress=None, cancelled=None):
+    """This function runs inside a worker thread (The Chef)
+
+    Besides the PNG bytes it returns a thumbnail already scaled to `size`,
+    so the UI thread never decodes or rescales the full-resolution image.
+    Every new generation is also written to the history store unless the
+    job was cancelled meanwhile (cache hits were recorded when they were first generated).
+    """
     try:
         print(f"Calling API with: {prompt}")
-        image_api.api(prompt) # This blocks here, but it's okay because it's a thread
+        key = image_api.request_key(prompt, NUM_STEPS, seed)
+        cached = cache.contains(key)
+        start = time.perf_counter()
+        data = image_api.api(prompt, num_steps=NUM_STEPS, seed=seed, progress=progress) # Blocks only this worker
         print("API Call Complete.")
+        if data is None:
+            return None
+        if not cached:
+            if cancelled and cancelled():
+                return None # Discarded by the scheduler anyway
+            history.add(prompt, NUM_STEPS, seed, time.perf_counter() - start, data)
+        return data, cache.thumbnail(key, data, size)
     except Exception as e:
         print(f"Error in API: {e}")
+        return None
+
+def collect_jobs():
+    """Returns (prompt, seed) pairs: one prompt per line in batch mode, each repeated N variations"""
+    text = input_box.get("1.0", "end-1c")
+    prompts = [line.strip() for line in text.splitlines() if line.strip()] if batch_switch.get() else [text]
+    try:
+        variations = max(1, int(variations_entry.get() or 1))
+    except ValueError:
+        variations = 1
+    return [(prompt, random.randrange(2**31) if variations > 1 else None)
+            for prompt in prompts for _ in range(variations)]
 
-def monitor_thread(thread):
-    if thread.is_alive():
-        current_text = make_btn.cget("text")
-        if current_text == "GENERATING...":
-            make_btn.configure(text="GENERATING   ")
-        else:
-            make_btn.configure(text="GENERATING...")
+def open_results_grid(count):
+    """Opens a window with one placeholder cell per job and returns the cell labels"""
+    window = customtkinter.CTkToplevel(app)
+    window.title(f"DreamAi Batch ({count} images)")
+    window.geometry(f"{GRID_COLUMNS * (GRID_THUMB[0] + 10) + 30}x460")
+    window.configure(fg_color="#101010")
+
+    grid_frame = customtkinter.CTkScrollableFrame(window, fg_color="#101010")
+    grid_frame.pack(fill="both", expand=True)
+
+    cells = []
+    for i in range(count):
+        cell = customtkinter.CTkLabel(grid_frame, text="GENERATING...", width=GRID_THUMB[0], height=GRID_THUMB[1],
+                                      fg_color="#202020", text_color="#CB37A0")
+        cell.grid(row=i // GRID_COLUMNS, column=i % GRID_COLUMNS, padx=4, pady=4)
+        cells.append(cell)
+    return cells
+
+def show_result(result, label, failed_text="FAILED"):
+    """Shows a pre-scaled result thumbnail in a label, or marks the label as failed"""
+    try:
+        if result is None:
+            label.configure(text=failed_text)
+            return
+        thumb = result[1]
         
-        # 2. Check again in 100ms
-        app.after(100, lambda: monitor_thread(thread))
+        new_ctk_image = customtkinter.CTkImage(
+            light_image=thumb,
+            dark_image=thumb,
+            size=thumb.size
+        )
+        
+        # Update the EXISTING label (Don't create a new one)
+        label.configure(image=new_ctk_image, text="")
+        label.image = new_ctk_image # Keep reference
+        
+    except Exception as e:
+        print(f"Error loading image: {e}") # e.g. the batch window was closed
+
+def on_job_progress(index, fraction, cells):
+    """Runs on the UI thread whenever a job reports download progress"""
+    try:
+        if cells is None:
+            make_btn.configure(text=f"CANCEL  ·  {fraction:.0%}")
+        elif cells[index].cget("text"):
+            cells[index].configure(text=f"GENERATING {fraction:.0%}")
+    except Exception:
+        pass # The batch window was closed
+
+def on_job_done(index, result, error, cells):
+    """Runs on the UI thread as soon as each job finishes, in completion order"""
+    if isinstance(error, asyncio.CancelledError):
+        if cells is not None:
+            show_result(None, cells[index], "CANCELLED")
+    elif cells is None:
+        show_result(result, result_image_label)
+        set_latest_image(result)
     else:
-        # --- THREAD IS DONE ---
-        print("Updating UI...")        
-        # 3. Reload the image from disk
-        try:
-            new_pil_image = Image.open("./images/flux_output.png")
-            
-            new_ctk_image = customtkinter.CTkImage(
-                light_image=new_pil_image,
-                dark_image=new_pil_image,
-                size=(360,420)
-            )
-            
-            # 4. Update the EXISTING label (Don't create a new one)
-            result_image_label.configure(image=new_ctk_image)
-            result_image_label.image = new_ctk_image # Keep reference
-            
-        except Exception as e:
-            print(f"Error loading image: {e}")
+        show_result(result, cells[index])
+        if result is not None: # Click a batch result to save it
+            cells[index].bind("<Button-1>", lambda event, data=result[0]: on_download_click(data))
+
+    if gallery is not None:
+        gallery.refresh()
+    hits, misses = cache.stats()
+    cache_label.configure(text=f"CACHE  hits {hits}  ·  misses {misses}")
 
-        # 5. Reset Button
-        make_btn.configure(text="GENERATE", state="normal")
+    if not scheduler.active:
+        # --- ALL JOBS DONE ---
+        make_btn.configure(text="GENERATE")
 
 def on_generate_click():
-    """This triggers the process"""
-    prompt_text = input_box.get("1.0", "end-1c")
-    
-    # 1. Disable button so user can't spam click
-    make_btn.configure(text="GENERATING...", state="disabled")
+    """This triggers the process, or cancels it while jobs are in flight"""
+    if scheduler.active:
+        scheduler.cancel_all()
+        return
+    jobs = collect_jobs()
+    if not jobs:
+        return
     
-    # 2. Start the Thread
-    t = threading.Thread(target=run_api_in_background, args=(prompt_text,))
-    t.start()
+    # 1. The button turns into CANCEL while anything is in flight
+    make_btn.configure(text="CANCEL")
     
-    # 3. Start the Monitor
-    monitor_thread(t)
+    # 2. Queue every job on the scheduler; a single job keeps the main result view
+    cells = open_results_grid(len(jobs)) if len(jobs) > 1 else None
+    size = RESULT_SIZE if cells is None else GRID_THUMB
+    for index, (prompt, seed) in enumerate(jobs):
+        scheduler.submit(run_api_in_background, prompt, seed, size,
+                         on_done=lambda result, error, index=index: on_job_done(index, result, error, cells),
+                         on_progress=lambda fraction, index=index: on_job_progress(index, fraction, cells),
+                         cancellable=True)
 
 # --- NEW: DOWNLOAD FUNCTION ---
-def on_download_click():
-    """Opens a file dialog to save the generated image"""
-    source_path = "./images/flux_output.png"
+def set_latest_image(result):
+    """Remembers the main result's bytes for DOWNLOAD (failed generations keep the previous one)"""
+    global latest_image
+    if result is not None:
+        latest_image = result[0]
+
+def on_download_click(data=None):
+    """Opens a file dialog to save the generated image (the main result by default)"""
+    data = data or latest_image
     
-    # Check if the generated image actually exists
-    if not os.path.exists(source_path):
+    # Check if an image has actually been generated
+    if data is None:
         print("No image found to download!")
         return
 
@@ -89,7 +185,8 @@ def on_download_click():
     # If user selected a path (didn't click cancel)
     if file_path:
         try:
-            shutil.copy(source_path, file_path)
+            with open(file_path, "wb") as f:
+                f.write(data)
             print(f"Image saved successfully to: {file_path}")
         except Exception as e:
             print(f"Error saving file: {e}")
@@ -120,6 +217,35 @@ text_2 = customtkinter.CTkLabel(
 )
 text_2.place(x=40, y=90)
 
+gallery = None
+
+def on_history_select(row):
+    """Loads a past generation into the main result view (decoded off the UI thread)"""
+    def load():
+        with open(row["image_path"], "rb") as f:
+            data = f.read()
+        return data, make_thumbnail(data, RESULT_SIZE)
+
+    def loaded(result):
+        show_result(result, result_image_label)
+        set_latest_image(result)
+
+    gallery.load_async(load, loaded)
+
+def on_history_click():
+    """Shows or hides the history gallery beside the generator"""
+    global gallery
+    if gallery is not None and gallery.winfo_ismapped():
+        gallery.pack_forget()
+        app.geometry("720x420")
+        return
+    if gallery is None:
+        gallery = HistoryGallery(app, history, on_history_select)
+    app.geometry(f"{720 + GALLERY_WIDTH}x420")
+    second_frame.pack_configure(side="left")
+    gallery.pack(side="right", fill="y")
+    gallery.refresh()
+
 def generate_event():
     landing_frame.pack_forget()
     second_frame.pack(fill="both", expand=True)
@@ -170,11 +296,26 @@ make_btn = customtkinter.CTkButton(
 )
 make_btn.place(x=0,y=375)
 
+cache_label = customtkinter.CTkLabel(second_frame, text="CACHE  hits 0  ·  misses 0", text_color="#888888",
+                                     fg_color="#202020", font=customtkinter.CTkFont(size=11))
+cache_label.place(x=10, y=310)
+
+# Batch controls: one prompt per line and/or N seeded variations per prompt
+batch_switch = customtkinter.CTkSwitch(second_frame, text="Batch (one prompt per line)", text_color="white",
+                                       progress_color="#CB37A0", fg_color="#202020", bg_color="#202020")
+batch_switch.place(x=10, y=340)
+
+variations_entry = customtkinter.CTkEntry(second_frame, width=50, placeholder_text="x1", fg_color="#101010",
+                                          text_color="white", bg_color="#202020")
+variations_entry.place(x=300, y=338)
+
 # Load initial result image (or placeholder)
 try:
-    my_image_1 = customtkinter.CTkImage(light_image=Image.open("./images/flux_output.png"),
-                                        dark_image=Image.open("./images/flux_output.png"),
-                                        size=(360,420))
+    my_image_1 = customtkinter.CTkImage(light_image=Image.open(STARTUP_IMAGE),
+                                        dark_image=Image.open(STARTUP_IMAGE),
+                                        size=RESULT_SIZE)
+    with open(STARTUP_IMAGE, "rb") as f:
+        latest_image = f.read() # DOWNLOAD saves the image on screen
 except:
     # Handle case where image doesn't exist yet
     my_image_1 = None 
@@ -198,4 +339,19 @@ download_btn = customtkinter.CTkButton(
 )
 download_btn.place(x=360,y=375)
 
-app.mainloop()
\ No newline at end of file
+history_btn = customtkinter.CTkButton(
+    second_frame,
+    text="HISTORY",
+    command=on_history_click,
+    fg_color="#202020",
+    hover_color="#303030",
+    width=80,
+    height=24,
+    corner_radius=0,
+    font=customtkinter.CTkFont(family="Montserrat", size=11, weight="bold"),
+    text_color='white'
+)
+history_btn.place(x=630,y=8)
+
+app.mainloop()
+scheduler.shutdown()
\ No newline at end of file
@@ -0,0 +1,67 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from image_cache import make_thumbnail
+
+# --- History Configuration ---
+HISTORY_DIR = "./images/history"
+DB_NAME = "history.db"
+GALLERY_THUMB = (64, 64)
+
+
+class HistoryStore:
+    """Persistent record of every generation: parameters, timing and where its images live."""
+
+    def __init__(self, directory=HISTORY_DIR):
+        self.directory = directory
+        os.makedirs(os.path.join(directory, "thumbs"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(directory, DB_NAME), check_same_thread=False)
+        self._db.execute("""CREATE TABLE IF NOT EXISTS generations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            prompt TEXT NOT NULL,
+            num_steps INTEGER,
+            seed INTEGER,
+            created_at REAL NOT NULL,
+            latency_s REAL,
+            image_path TEXT NOT NULL,
+            thumb_path TEXT NOT NULL)""")
+        self._db.commit()
+
+    def add(self, prompt, num_steps, seed, latency_s, data):
+        """Writes the PNG and its gallery thumbnail to disk and records the generation. Returns its id."""
+        created_at = time.time()
+        name = f"{int(created_at * 1000)}_{uuid.uuid4().hex[:12]}.png"
+        image_path = os.path.join(self.directory, name)
+        thumb_path = os.path.join(self.directory, "thumbs", name)
+
+        with open(image_path, "wb") as f:
+            f.write(data)
+        make_thumbnail(data, GALLERY_THUMB).save(thumb_path)
+
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO generations (prompt, num_steps, seed, created_at, latency_s, image_path, thumb_path) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (prompt, num_steps, seed, created_at, latency_s, image_path, thumb_path))
+            self._db.commit()
+            return cursor.lastrowid
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM generations").fetchone()[0]
+
+    def page(self, offset, limit):
+        """Rows `offset`..`offset + limit` counting from the newest, as dicts."""
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT id, prompt, num_steps, seed, created_at, latency_s, image_path, thumb_path "
+                "FROM generations ORDER BY id DESC LIMIT ? OFFSET ?", (limit, offset))
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+history = HistoryStore()
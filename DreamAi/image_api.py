@@ -1,32 +1,179 @@
 import requests
+import asyncio
 import base64
+import io
+import os
+import re
+import threading
+import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from image_cache import cache, cache_key
+import metrics
 
 MODEL_ID = "@cf/black-forest-labs/flux-1-schnell"
 ACCOUNT_ID = "c96c0833fcae9d3ec03167389ce13422"
 API_TOKEN = "Fe32o7UlYzV9lC7GpHp_SiDlBglu_2fH3mPv3iEf" 
 
-def api(prompt='create an image of cat'):
+# --- Connection Settings ---
+# API_BASE can point at stub_server.py for offline testing, e.g. DREAMAI_API_BASE=http://127.0.0.1:8787
+API_BASE = os.environ.get("DREAMAI_API_BASE", "https://api.cloudflare.com/client/v4")
+POOL_SIZE = 8               # Keep-alive connections kept per host
+TIMEOUT = (5, 120)          # (connect, read) seconds
+RETRIES = 3                 # Retries on 429/5xx and connection errors
+BACKOFF = 0.5               # Exponential backoff factor between retries (honours Retry-After)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+STREAM_CHUNK = 64 * 1024    # Response bytes read (and base64-decoded) at a time
+IMAGE_FIELD = re.compile(rb'"image"\s*:\s*"')
+
+_session = None
+_session_lock = threading.Lock()
+
+def configure(base_url=None, pool_size=None, timeout=None, retries=None, backoff=None):
+    """Changes connection settings; the shared session is rebuilt on the next request."""
+    global API_BASE, POOL_SIZE, TIMEOUT, RETRIES, BACKOFF, _session
+    with _session_lock:
+        API_BASE = base_url or API_BASE
+        POOL_SIZE = pool_size or POOL_SIZE
+        TIMEOUT = timeout or TIMEOUT
+        RETRIES = RETRIES if retries is None else retries
+        BACKOFF = BACKOFF if backoff is None else backoff
+        if _session is not None:
+            _session.close()
+        _session = None
+
+def get_session():
+    """Returns the shared, pooled session (created on first use)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(total=RETRIES, backoff_factor=BACKOFF, status_forcelist=RETRY_STATUSES,
+                          allowed_methods=frozenset({"POST"}), raise_on_status=False)
+            adapter = metrics.instrument(HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry))
+            session = requests.Session()
+            session.headers["Authorization"] = f"Bearer {API_TOKEN}"
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def request_key(prompt, num_steps=8, seed=None):
+    """Image cache key of a generation request."""
+    return cache_key(model=MODEL_ID, prompt=prompt, num_steps=num_steps, seed=seed)
+
+def _stream_image(response, progress=None):
+    """Base64-decodes result.image while the body streams in.
+
+    Only the decoded bytes and one chunk of base64 text are held at a time,
+    never the whole JSON body. Returns (a memoryview of the image bytes or None, the rest of
+    the JSON envelope); the view shares the decode buffer rather than copying it.
+    `progress(fraction)` is called per chunk when the server sends a Content-Length.
+    Bytes received and time spent decoding are added to the current request's metrics.
+    """
+    envelope, image, pending = bytearray(), io.BytesIO(), b""
+    state = "search"
+    total, received = int(response.headers.get("Content-Length") or 0), 0
+    decoding = 0.0
+    for chunk in response.iter_content(STREAM_CHUNK):
+        received += len(chunk)
+        if progress and total:
+            progress(min(received / total, 1.0))
+        if state == "search":
+            envelope += chunk
+            match = IMAGE_FIELD.search(envelope)
+            if match is None:
+                continue
+            chunk = bytes(envelope[match.end():])
+            del envelope[match.start():]
+            state = "image"
+        if state == "image":
+            end = chunk.find(b'"')
+            text = pending + (chunk if end < 0 else chunk[:end]).replace(b"\\", b"") # JSON may escape "/" as "\/"
+            usable = len(text) - len(text) % 4
+            started = time.perf_counter()
+            image.write(base64.b64decode(text[:usable]))
+            decoding += time.perf_counter() - started
+            pending = text[usable:]
+            if end >= 0:
+                envelope += chunk[end + 1:]
+                state = "tail"
+        else:
+            envelope += chunk
+
+    metrics.add("response_bytes", received)
+    metrics.add("decode_s", decoding)
+    if state == "search":
+        return None, bytes(envelope)
+    image.write(base64.b64decode(pending))
+    return image.getbuffer(), bytes(envelope)
+
+def api(prompt='create an image of cat', num_steps=8, seed=None, use_cache=True, progress=None):
+    """Generates one image and returns its PNG bytes (a memoryview for fresh generations), or None on failure.
+
+    Nothing is written to output files.
+
+    Repeated requests with the same model and inputs are answered from the on-disk image cache.
+    `progress(fraction)` reports how much of the response has been downloaded.
+    """
     inputs = {
     "prompt":prompt,
-    "num_steps": 8,
+    "num_steps": num_steps,
     }
-    response = requests.post(
-        f"https://api.cloudflare.com/client/v4/accounts/{ACCOUNT_ID}/ai/run/{MODEL_ID}",
-        headers={"Authorization": f"Bearer {API_TOKEN}"},
-        json=inputs
-    )
-
-    if response.status_code == 200:
-        result = response.json()
-        if "result" in result and "image" in result["result"]:
-        # Decode and Save
-            img_data = base64.b64decode(result["result"]["image"])
-            with open("./images/flux_output.png", "wb") as f:
-                f.write(img_data)
-            print("Success! Saved as 'flux_output.png'")
+    if seed is not None:
+        inputs["seed"] = seed
+
+    key = request_key(prompt, num_steps, seed)
+    record = metrics.start()
+    record.update(num_steps=num_steps, seed=seed)
+    cached_path = cache.get(key) if use_cache else None
+    if cached_path is not None:
+        with open(cached_path, "rb") as f:
+            print("Cache hit!")
+            data = f.read()
+        metrics.finish(record, "cache", image_bytes=len(data))
+        return data
+
+    status, response = "error", None
+    try:
+        started = time.perf_counter()
+        response = get_session().post(
+            f"{API_BASE}/accounts/{ACCOUNT_ID}/ai/run/{MODEL_ID}",
+            json=inputs,
+            timeout=TIMEOUT,
+            stream=True
+        )
+        # Time to response headers: connect + upload + server inference + retry backoff
+        record["headers_s"] = time.perf_counter() - started
+        record["wait_s"] = record["headers_s"] - record["connect_s"]
+        record["server_s"] = metrics.server_time(response.headers)
+        record["request_bytes"] = len(response.request.body or b"")
+        record["retries"] = len(response.raw.retries.history) if response.raw.retries else 0
+        status = response.status_code
+
+        if response.status_code == 200:
+            # Decode in memory as it arrives; the caller decides whether the image is ever saved
+            started = time.perf_counter()
+            img_data, envelope = _stream_image(response, progress)
+            record["download_s"] = time.perf_counter() - started - record.get("decode_s", 0.0)
+            if img_data is not None:
+                record["image_bytes"] = len(img_data)
+                if use_cache:
+                    started = time.perf_counter()
+                    cache.put(key, img_data)
+                    record["write_s"] = time.perf_counter() - started
+                print("Success!")
+                return img_data
+            else:
+                status = "parse_error"
+                print("Error parsing result:", envelope.decode(errors="replace"))
         else:
-         print("Error parsing result:", result)
-    else:
-        print(f"Error: {response.status_code}")
-        print(response.text)
-        
\ No newline at end of file
+            print(f"Error: {response.status_code}")
+            print(response.text)
+        return None
+    except asyncio.CancelledError: # Raised by a scheduler progress callback once the job is cancelled
+        status = "cancelled"
+        raise
+    finally:
+        if response is not None:
+            response.close() # Returns the pooled connection even when the stream was abandoned midway
+        metrics.finish(record, status)
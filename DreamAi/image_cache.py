@@ -0,0 +1,166 @@
+import atexit
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from PIL import Image
+
+# --- Cache Configuration ---
+CACHE_DIR = "./images/cache"
+INDEX_FILE = "index.json"
+MAX_BYTES = 256 * 1024 * 1024   # Least recently used images are evicted beyond this
+THUMB_FILTER = Image.Resampling.BILINEAR
+
+
+def cache_key(**inputs):
+    """Content address of a generation request: SHA-256 of its canonical JSON inputs."""
+    canonical = json.dumps(inputs, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class BufferReader(io.RawIOBase):
+    """Read-only, seekable file over any bytes-like object (io.BytesIO would copy a memoryview)."""
+
+    def __init__(self, data):
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self._view[self._pos:self._pos + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(base + offset, 0)
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+
+def make_thumbnail(data, size):
+    """Decodes PNG bytes (or a memoryview of them) and scales them to `size`, box-reducing first so large images stay cheap."""
+    image = Image.open(BufferReader(data))
+    image.draft("RGB", size)
+    return image.resize(size, THUMB_FILTER, reducing_gap=2.0)
+
+
+class ImageCache:
+    """Size-bounded LRU cache of generated PNGs, tracked by an index file."""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        self._dirty = False # last_used changed by get() but not yet written
+
+    def _load_index(self):
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE)) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Drop entries whose image file has gone missing
+        return {key: entry for key, entry in index.items()
+                if os.path.exists(os.path.join(self.directory, entry["file"]))}
+
+    def _save_index(self):
+        path = os.path.join(self.directory, INDEX_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self._index, f)
+        os.replace(path + ".tmp", path)
+        self._dirty = False
+
+    def flush(self):
+        """Writes last_used times recorded by get() since the last save (called at exit)."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.png")
+
+    def thumb_path(self, key, size):
+        return os.path.join(self.directory, f"{key}_{size[0]}x{size[1]}.png")
+
+    def contains(self, key):
+        """True if `key` is cached; unlike get() it neither counts a hit nor marks the entry used."""
+        with self._lock:
+            return key in self._index
+
+    def get(self, key):
+        """Returns the cached image path for `key` and marks it recently used, or None.
+
+        The new last_used time is kept in memory; put(), thumbnail() or flush() persist it.
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry["last_used"] = time.time()
+            self._dirty = True
+            return os.path.join(self.directory, entry["file"])
+
+    def put(self, key, data):
+        """Stores image bytes under `key`, evicting least recently used images over the size cap."""
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.path(key), "wb") as f:
+                f.write(data)
+            self._index[key] = {"file": f"{key}.png", "size": len(data), "last_used": time.time()}
+
+            total = sum(entry["size"] for entry in self._index.values())
+            for old_key in sorted(self._index, key=lambda k: self._index[k]["last_used"]):
+                if total <= self.max_bytes or old_key == key:
+                    break
+                evicted = self._index.pop(old_key)
+                total -= evicted["size"]
+                for name in [evicted["file"], *evicted.get("thumbs", [])]:
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+            self._save_index()
+            return self.path(key)
+
+    def thumbnail(self, key, data, size):
+        """Returns a display-sized image for `key`, scaling it once and keeping it beside the full image."""
+        path = self.thumb_path(key, size)
+        try:
+            with Image.open(path) as cached:
+                cached.load()
+                return cached
+        except OSError:
+            pass
+
+        thumb = make_thumbnail(data, size)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is not None:
+                thumb.save(path)
+                entry.setdefault("thumbs", []).append(os.path.basename(path))
+                self._save_index()
+        return thumb
+
+    def stats(self):
+        """(hits, misses) since start-up."""
+        return self.hits, self.misses
+
+
+cache = ImageCache()
+atexit.register(cache.flush)
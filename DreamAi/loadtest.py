@@ -0,0 +1,157 @@
+"""Offline load test of the image_api generation path against stub_server.py.
+
+Usage: python loadtest.py --levels 1 2 4 8 16 32 --requests 64 --latency 0.25 --payload-kb 1024 --error-rate 0.05
+
+The stub runs in its own process and every concurrency level in a fresh
+client process, so the CPU time and peak RSS reported are the client's.
+"""
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError: # Windows: peak RSS is not reported
+    resource = None
+
+# --- Load Test Configuration ---
+DEFAULT_LEVELS = [1, 2, 4, 8, 16, 32]
+REQUESTS = 64                # Requests per level
+LATENCY = 0.25               # Stub inference time per request, seconds
+PAYLOAD_KB = 1024            # Image size returned by the stub
+METRICS_LOG = "./images/metrics/loadtest.jsonl" # Kept apart from the app's own request log
+PERCENTILES = (0.5, 0.95, 0.99)
+PHASES = ("connect_s", "wait_s", "download_s", "decode_s") # Mean seconds per generated image
+
+
+def start_stub(latency=LATENCY, payload_kb=PAYLOAD_KB, error_rate=0.0, seed=None):
+    """Starts stub_server.py in its own process; returns (process, base_url)."""
+    command = [sys.executable, "stub_server.py", "--port", "0", "--latency", str(latency),
+               "--payload-kb", str(payload_kb), "--error-rate", str(error_rate)]
+    if seed is not None:
+        command += ["--seed", str(seed)]
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline() # "Stub serving on <url>  (...)"
+    if not line:
+        raise RuntimeError(f"stub_server.py exited with code {proc.wait()}")
+    return proc, line.split()[3]
+
+# --- Client Side ---
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / 1024**2 if sys.platform == "darwin" else peak / 1024, 1) # bytes on macOS, KiB elsewhere
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)] if ordered else None
+
+def run_level(base_url, concurrency, requests=REQUESTS, retries=None):
+    """Sends `requests` uncached generations through image_api.api, `concurrency` at a time.
+
+    Runs inside its own worker process.
+    """
+    import image_api
+    import metrics
+
+    metrics.LOG_PATH = METRICS_LOG
+    image_api.configure(base_url=base_url, pool_size=concurrency, retries=retries)
+    records = []
+    metrics.add_listener(records.append)
+
+    def generate(i):
+        started = time.perf_counter()
+        data = image_api.api(prompt=f"load test {i}", seed=i, use_cache=False)
+        return time.perf_counter() - started, data is not None
+
+    cpu_before, rss_before = os.times(), _peak_rss_mb()
+    started = time.perf_counter()
+    with open(os.devnull, "w") as quiet, contextlib.redirect_stdout(quiet): # api() prints per request
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(generate, range(requests)))
+    wall = time.perf_counter() - started
+    cpu_after = os.times()
+
+    latencies = [latency for latency, ok in results if ok]
+    cpu = (cpu_after.user - cpu_before.user) + (cpu_after.system - cpu_before.system)
+    generated = [record for record in records if record["status"] == 200]
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "ok": len(latencies),
+        "failed": requests - len(latencies),
+        "retries": sum(record.get("retries", 0) for record in records),
+        "wall_s": round(wall, 4),
+        "images_per_s": round(len(latencies) / wall, 2),
+        "latency_s": {str(q): _percentile(latencies, q) for q in PERCENTILES},
+        "client_cpu_s": round(cpu, 4),
+        "cpu_ms_per_image": round(cpu * 1000 / len(latencies), 2) if latencies else None,
+        "phases_s": {phase: round(sum(record.get(phase, 0.0) for record in generated) / len(generated), 4)
+                     for phase in PHASES} if generated else {},
+        "baseline_rss_mb": rss_before,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+# --- Suite ---
+
+def _print_level(result):
+    latency = result["latency_s"]
+    p50, p95, p99 = (f"{latency[str(q)]:.3f}" if latency[str(q)] is not None else "-" for q in PERCENTILES)
+    phases = " ".join(f"{name[:-2]}={value * 1000:.0f}ms" for name, value in result["phases_s"].items())
+    print(f"{result['concurrency']:>5} {result['images_per_s']:>9.2f} {p50:>8} {p95:>8} {p99:>8} "
+          f"{result['client_cpu_s']:>8.2f} {result['cpu_ms_per_image'] or 0:>9.1f} {result['peak_rss_mb'] or 0:>9.1f} "
+          f"{result['failed']:>4}/{result['retries']:<4} {phases}")
+
+def run(levels, requests=REQUESTS, latency=LATENCY, payload_kb=PAYLOAD_KB, error_rate=0.0, retries=None,
+        seed=None, base_url=None, out=None):
+    """Runs every concurrency level against a stub (or `base_url`) and optionally writes the results as JSON."""
+    stub = None
+    if base_url is None:
+        stub, base_url = start_stub(latency, payload_kb, error_rate, seed)
+    suite = {"settings": {"base_url": base_url, "requests": requests, "latency_s": latency, "payload_kb": payload_kb,
+                          "error_rate": error_rate, "retries": retries, "cpus": os.cpu_count(),
+                          "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+             "results": []}
+    print(f"{'conc':>5} {'images/s':>9} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'cpu s':>8} {'cpu ms/img':>9} "
+          f"{'peak MB':>9} fail/retry phases")
+    try:
+        for concurrency in levels:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                result = pool.submit(run_level, base_url, concurrency, requests, retries).result()
+            suite["results"].append(result)
+            _print_level(result)
+    finally:
+        if stub is not None:
+            stub.terminate()
+            stub.wait()
+
+    if out:
+        with open(out, "w") as f:
+            json.dump(suite, f, indent=2)
+    return suite
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test DreamAi's image_api against a local stub server.")
+    parser.add_argument("--levels", type=int, nargs="+", default=DEFAULT_LEVELS, help="concurrency levels to run")
+    parser.add_argument("--requests", type=int, default=REQUESTS, help="requests per level")
+    parser.add_argument("--latency", type=float, default=LATENCY, help="stub inference seconds per request")
+    parser.add_argument("--payload-kb", type=int, default=PAYLOAD_KB, help="image size returned by the stub")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of stub responses that are 500s")
+    parser.add_argument("--retries", type=int, help="client retries (default: image_api.RETRIES)")
+    parser.add_argument("--seed", type=int, help="seed for the stub's payload and errors")
+    parser.add_argument("--url", help="test an already running server instead of starting a stub")
+    parser.add_argument("-o", "--out", help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    run(args.levels, args.requests, args.latency, args.payload_kb, args.error_rate, args.retries, args.seed,
+        args.url, args.out)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""Per-request metrics for image_api: a rotating JSONL log plus an optional Prometheus-style endpoint.
+
+Set DREAMAI_METRICS_PORT (e.g. 9464) to serve /metrics while DreamAi runs.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import RotatingFileHandler
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# --- Metrics Configuration ---
+LOG_PATH = "./images/metrics/requests.jsonl"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+WINDOW = 1000                # Recent requests kept for latency percentiles
+RATE_WINDOW_S = 60           # Images per minute is counted over this trailing window
+PERCENTILES = (0.5, 0.95, 0.99)
+
+_local = threading.local()
+_lock = threading.Lock()
+_recent = deque(maxlen=WINDOW)          # (finished_at, total_s, status)
+_totals = {}                            # status -> request count
+_logger = None
+_listeners = []                         # Called with every finished record, see add_listener
+
+
+# --- Phase timing ---
+
+def start():
+    """Begins collecting timings for a request made on this thread and returns its record."""
+    _local.record = {"ts": time.time(), "connect_s": 0.0, "connections": 0}
+    return _local.record
+
+def add(field, amount):
+    """Adds to a timing or size field of this thread's current request, if one is being recorded."""
+    record = getattr(_local, "record", None)
+    if record is not None:
+        record[field] = record.get(field, 0) + amount
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        started = time.perf_counter()
+        super().connect() # DNS lookup + TCP connect
+        add("connect_s", time.perf_counter() - started)
+        add("connections", 1)
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        started = time.perf_counter()
+        super().connect() # DNS lookup + TCP connect + TLS handshake
+        add("connect_s", time.perf_counter() - started)
+        add("connections", 1)
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+def instrument(adapter):
+    """Makes new connections opened by a requests HTTPAdapter report their connect time."""
+    adapter.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool,
+                                                  "https": _TimedHTTPSConnectionPool}
+    return adapter
+
+def server_time(headers):
+    """Server-side processing seconds from a `Server-Timing: <name>;dur=<ms>` header, if sent."""
+    total = None
+    for part in headers.get("Server-Timing", "").split(","):
+        for param in part.split(";")[1:]:
+            name, _, value = param.strip().partition("=")
+            if name == "dur":
+                try:
+                    total = (total or 0.0) + float(value) / 1000
+                except ValueError:
+                    pass
+    return total
+
+
+# --- Recording ---
+
+def _get_logger():
+    global _logger
+    if _logger is None:
+        with _lock: # Worker threads may finish their first requests together; only one may attach the handler
+            if _logger is None:
+                os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+                handler = RotatingFileHandler(LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS)
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger = logging.getLogger("dreamai.metrics")
+                logger.propagate = False
+                logger.setLevel(logging.INFO)
+                logger.addHandler(handler)
+                _logger = logger
+    return _logger
+
+def finish(record, status, **fields):
+    """Completes this thread's request record, appends it to the JSONL log and the live window."""
+    _local.record = None
+    record.update(fields)
+    record["status"] = status
+    record["total_s"] = time.time() - record["ts"]
+    for key, value in record.items():
+        if isinstance(value, float) and key != "ts":
+            record[key] = round(value, 4)
+    with _lock:
+        _recent.append((time.time(), record["total_s"], status))
+        _totals[status] = _totals.get(status, 0) + 1
+    try:
+        _get_logger().info(json.dumps(record))
+    except OSError as e:
+        print(f"Could not write metrics: {e}")
+    for listener in _listeners:
+        listener(record)
+    return record
+
+def add_listener(listener):
+    """Calls `listener(record)` for every request finished from now on (e.g. loadtest.py's phase breakdown)."""
+    _listeners.append(listener)
+
+
+# --- Summaries ---
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+def snapshot():
+    """Latency percentiles (generated images only), images per minute and request totals."""
+    now = time.time()
+    with _lock:
+        latencies = [total for _, total, status in _recent if status == 200]
+        per_minute = sum(1 for finished, _, status in _recent
+                         if status in (200, "cache") and now - finished <= RATE_WINDOW_S)
+        totals = dict(_totals)
+    return {
+        "latency": {q: _percentile(latencies, q) for q in PERCENTILES} if latencies else {},
+        "images_per_minute": per_minute * 60 / RATE_WINDOW_S,
+        "requests": totals,
+    }
+
+def render():
+    """The snapshot in Prometheus text exposition format."""
+    data = snapshot()
+    lines = ["# TYPE dreamai_request_latency_seconds summary"]
+    lines += [f'dreamai_request_latency_seconds{{quantile="{q}"}} {value:.4f}' for q, value in data["latency"].items()]
+    lines += ["# TYPE dreamai_images_per_minute gauge", f"dreamai_images_per_minute {data['images_per_minute']:.2f}",
+              "# TYPE dreamai_requests_total counter"]
+    lines += [f'dreamai_requests_total{{status="{status}"}} {count}' for status, count in data["requests"].items()]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(port):
+    """Serves /metrics on localhost from a background thread and returns the server."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Metrics on http://127.0.0.1:{server.server_address[1]}/metrics")
+    return server
+
+def serve_from_env():
+    """Starts the endpoint when DREAMAI_METRICS_PORT is set; returns the server or None."""
+    port = os.environ.get("DREAMAI_METRICS_PORT")
+    return serve(int(port)) if port else None
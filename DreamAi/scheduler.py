@@ -0,0 +1,117 @@
+import asyncio
+import functools
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Scheduler Configuration ---
+DEFAULT_CONCURRENCY = 4
+
+
+class JobScheduler:
+    """Runs blocking jobs from an asyncio loop on a background thread and reports back to Tk.
+
+    Completions and progress updates are put on a thread-safe queue and the
+    Tk loop is woken with a virtual event, so the UI reacts as soon as a job
+    finishes instead of polling with `after`.
+    """
+
+    def __init__(self, widget, max_concurrency=DEFAULT_CONCURRENCY):
+        self.widget = widget
+        self.max_concurrency = max_concurrency
+        self.event_name = f"<<JobEvent{id(self)}>>"
+        self.events = queue.Queue()       # (callback, args) to run on the Tk thread
+        self.jobs = {}                    # job id -> concurrent.futures.Future of its coroutine
+        self._cancelled = {}              # job id -> threading.Event set by cancel(), seen by its worker
+        self._ids = itertools.count(1)
+
+        self.loop = asyncio.new_event_loop()
+        self.loop.set_default_executor(ThreadPoolExecutor(max_workers=max_concurrency))
+        self._limit = None
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+        widget.bind(self.event_name, self._drain, add="+")
+
+    def submit(self, fn, *args, on_done=None, on_progress=None, cancellable=False, **kwargs):
+        """Queues `fn(*args, **kwargs)` and returns a job id.
+
+        `on_done(result, error)` runs on the Tk thread when the job ends
+        (error is None, the exception, or asyncio.CancelledError). If
+        `on_progress` is given, `fn` receives a `progress(value)` keyword
+        that forwards `on_progress(value)` to the Tk thread; once the job is
+        cancelled, calling it raises asyncio.CancelledError so the worker
+        stops, and updates already queued are dropped. With `cancellable`,
+        `fn` also receives a `cancelled()` keyword to check before side effects.
+        """
+        job_id = next(self._ids)
+        cancelled = self._cancelled[job_id] = threading.Event()
+        if cancellable:
+            kwargs["cancelled"] = cancelled.is_set
+        if on_progress is not None:
+            def progress(value):
+                if cancelled.is_set():
+                    raise asyncio.CancelledError()
+                self._post(self._progress, job_id, on_progress, value)
+            kwargs["progress"] = progress
+        call = functools.partial(fn, *args, **kwargs)
+        self.jobs[job_id] = asyncio.run_coroutine_threadsafe(self._run(job_id, call, on_done), self.loop)
+        return job_id
+
+    def cancel(self, job_id):
+        """Cancels a job; if it is already running its result is discarded."""
+        future = self.jobs.get(job_id)
+        if future is not None:
+            self._cancelled[job_id].set()
+            self.loop.call_soon_threadsafe(future.cancel)
+
+    def cancel_all(self):
+        for job_id in list(self.jobs):
+            self.cancel(job_id)
+
+    @property
+    def active(self):
+        return len(self.jobs)
+
+    async def _run(self, job_id, call, on_done):
+        if self._limit is None:
+            self._limit = asyncio.Semaphore(self.max_concurrency)
+        result, error = None, None
+        try:
+            async with self._limit:
+                result = await self.loop.run_in_executor(None, call)
+        except asyncio.CancelledError as e:
+            error = e
+        except Exception as e:
+            error = e
+        self._post(self._finish, job_id, on_done, result, error)
+
+    def _progress(self, job_id, on_progress, value):
+        if job_id in self.jobs and not self._cancelled[job_id].is_set():
+            on_progress(value)
+
+    def _finish(self, job_id, on_done, result, error):
+        self.jobs.pop(job_id, None)
+        self._cancelled.pop(job_id, None)
+        if on_done is not None:
+            on_done(result, error)
+
+    def _post(self, callback, *args):
+        """Hands a callback to the Tk thread and wakes its event loop."""
+        self.events.put((callback, args))
+        try:
+            self.widget.event_generate(self.event_name, when="tail")
+        except Exception as e:
+            print(f"Could not wake the UI: {e}") # e.g. the window is already closed
+
+    def _drain(self, event=None):
+        while True:
+            try:
+                callback, args = self.events.get_nowait()
+            except queue.Empty:
+                break
+            callback(*args)
+
+    def shutdown(self):
+        self.cancel_all()
+        self.loop.call_soon_threadsafe(self.loop.stop)
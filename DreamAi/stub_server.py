@@ -0,0 +1,104 @@
+"""Local stand-in for the Cloudflare Workers AI endpoint used by image_api.
+
+Usage: python stub_server.py --port 8787 --latency 0.5 --fail-first 2
+then run DreamAi with DREAMAI_API_BASE=http://127.0.0.1:8787
+
+--payload-kb swaps the PNG for random bytes of that size and --error-rate
+answers that share of requests with a 500, for loadtest.py.
+"""
+import argparse
+import base64
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_IMAGE = "./images/flux_output.png"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers POST /accounts/<id>/ai/run/<model> with the `result.image` response shape."""
+    protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse can be observed
+
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.requests += 1
+            failing = server.requests <= server.fail_first
+            erroring = server.error_rate and server.random.random() < server.error_rate
+
+        started = time.perf_counter()
+        time.sleep(server.latency)
+        self.inference_ms = (time.perf_counter() - started) * 1000
+        if "/ai/run/" not in self.path:
+            return self._send(404, {"success": False, "errors": [{"message": "No route"}]})
+        if failing:
+            return self._send(503, {"success": False, "errors": [{"message": "Stub failure"}]})
+        if erroring:
+            return self._send(500, {"success": False, "errors": [{"message": "Stub random error"}]})
+        self._send(200, server.ok_body)
+
+    def _send(self, status, payload):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Server-Timing", f"inference;dur={self.inference_ms:.1f}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # Room for a burst of concurrent connects from loadtest.py
+
+
+def serve(port=0, latency=0.0, fail_first=0, image_path=DEFAULT_IMAGE, payload_bytes=None, error_rate=0.0, seed=None):
+    """Starts the stub on a background thread and returns (server, base_url).
+
+    `payload_bytes` replaces the image with that many random bytes; `error_rate`
+    is the share of requests answered with a 500 (drawn from `seed`).
+    """
+    server = StubServer(("127.0.0.1", port), StubHandler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.latency = latency
+    server.fail_first = fail_first
+    server.error_rate = error_rate
+    server.random = random.Random(seed)
+    if payload_bytes is None:
+        with open(image_path, "rb") as f:
+            image = f.read()
+    else:
+        image = server.random.randbytes(payload_bytes)
+    server.image_b64 = base64.b64encode(image).decode()
+    # Encoded once, so large payloads do not make the stub the bottleneck
+    server.ok_body = json.dumps({"result": {"image": server.image_b64}, "success": True, "errors": [], "messages": []}).encode()
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve fake image generations for DreamAi.")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before answering")
+    parser.add_argument("--fail-first", type=int, default=0, help="answer the first N requests with 503")
+    parser.add_argument("--image", default=DEFAULT_IMAGE, help="PNG returned for every request")
+    parser.add_argument("--payload-kb", type=int, help="return this many KiB of random bytes instead of --image")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 500")
+    parser.add_argument("--seed", type=int, help="seed for the payload and the errors")
+    args = parser.parse_args()
+
+    payload_bytes = args.payload_kb * 1024 if args.payload_kb is not None else None
+    server, url = serve(args.port, args.latency, args.fail_first, args.image, payload_bytes, args.error_rate, args.seed)
+    print(f"Stub serving on {url}  (DREAMAI_API_BASE={url})", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
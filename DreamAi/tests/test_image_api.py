@@ -0,0 +1,46 @@
+import base64
+import json
+import os
+
+import pytest
+
+from image_api import _stream_image
+
+
+class FakeResponse:
+    """Serves a body in fixed-size chunks, like requests' iter_content."""
+
+    def __init__(self, body, size):
+        self.body = body
+        self.size = size
+        self.headers = {"Content-Length": str(len(body))}
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), self.size):
+            yield self.body[start:start + self.size]
+
+
+@pytest.fixture(scope="module")
+def image():
+    return os.urandom(30_001)
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64, 4096, 1 << 20])
+@pytest.mark.parametrize("escaped", [False, True])
+def test_stream_decode_matches_b64decode(image, size, escaped):
+    encoded = base64.b64encode(image).decode()
+    body = json.dumps({"id": 7, "result": {"image": encoded}, "status": "ok"})
+    if escaped:
+        body = body.replace("/", "\\/")
+    seen = []
+    data, envelope = _stream_image(FakeResponse(body.encode(), size), seen.append)
+    assert bytes(data) == base64.b64decode(encoded)
+    assert seen[-1] == 1.0
+    assert b'"status": "ok"' in envelope
+
+
+def test_stream_without_image_returns_envelope():
+    body = json.dumps({"error": "quota exceeded"}).encode()
+    data, envelope = _stream_image(FakeResponse(body, 5))
+    assert data is None
+    assert json.loads(envelope) == {"error": "quota exceeded"}
@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import messagebox
-import subprocess
-import sys
+import os
+import warm_pool
 
 # --- Configuration ---
 # Color Palette (VS Code Style)
@@ -16,17 +16,50 @@ HOVER_TINT = "#444444"     # Color when hovering
 TITLE_FONT = ("Helvetica", 18, "bold")
 BTN_FONT = ("Segoe UI", 12, "bold")
 
-def run_dream_ai():
+# Warm Start
+WARM_START = os.environ.get("LAUNCHER_WARM", "1") != "0"  # LAUNCHER_WARM=0 launches cold, for comparison
+RESPAWN_DELAY_MS = 5000    # Replacement standby starts after the app has had the CPU to itself
+TIMING_POLL_MS = 250
+TIMING_WAIT_MS = 60000
+REAP_INTERVAL_MS = 10000   # How often closed apps are reaped while the launcher stays open
+
+pool = warm_pool.WarmPool(warm=WARM_START)
+
+def launch(app):
+    """Hands the click to the app's standby and shows its click-to-window time when it reports."""
     try:
-        subprocess.Popen([sys.executable, "gui.py"], cwd="DreamAi")
+        _, log_offset = warm_pool.read_launch_times()
+        mode = pool.launch(app)
     except Exception as e:
-        messagebox.showerror("Error", f"Could not open DreamAi: {e}")
+        messagebox.showerror("Error", f"Could not open {warm_pool.APPS[app]['name']}: {e}")
+        return
+    lbl_footer.config(text=f"Opening {warm_pool.APPS[app]['name']} ({mode})...")
+    root.after(RESPAWN_DELAY_MS, lambda: pool.replenish(app))
+    root.after(TIMING_POLL_MS, lambda: show_launch_time(app, log_offset, TIMING_WAIT_MS))
+
+def show_launch_time(app, offset, remaining_ms):
+    records, offset = warm_pool.read_launch_times(offset)
+    for record in records:
+        if record["app"] == app:
+            lbl_footer.config(text=f"{warm_pool.APPS[app]['name']} window in {record['click_to_window_s']:.2f} s "
+                                   f"({record['mode']})")
+            return
+    if remaining_ms > 0:
+        root.after(TIMING_POLL_MS, lambda: show_launch_time(app, offset, remaining_ms - TIMING_POLL_MS))
+
+def run_dream_ai():
+    launch("dreamai")
 
 def run_diamond_analyzer():
-    try:
-        subprocess.Popen([sys.executable, "main.py"], cwd="DimonPriceAnalyzer")
-    except Exception as e:
-        messagebox.showerror("Error", f"Could not open Analyzer: {e}")
+    launch("diamond")
+
+def reap_closed_apps():
+    pool.reap()
+    root.after(REAP_INTERVAL_MS, reap_closed_apps)
+
+def on_close():
+    pool.shutdown()
+    root.destroy()
 
 # --- Hover Effects ---
 def on_enter(e, color):
@@ -83,4 +116,6 @@ lbl_footer = tk.Label(root, text="v1.0 • Python-Jackfruit", font=("Arial", 8),
                       bg=BG_COLOR, fg="#666666")
 lbl_footer.pack(side="bottom", pady=10)
 
+root.protocol("WM_DELETE_WINDOW", on_close)
+root.after(REAP_INTERVAL_MS, reap_closed_apps)
 root.mainloop()
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""Warm standby interpreters for the launcher.
+
+Each app gets a standby process that has already imported its heavy
+modules and waits on stdin; a click hands it the click time and it runs the
+app script in place, so the window appears without the cold import cost.
+Click-to-first-window times are appended to LAUNCH_LOG.
+
+Run directly (python warm_pool.py <app>) it is the standby process itself.
+"""
+import importlib
+import json
+import os
+import runpy
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+LAUNCH_LOG = os.path.join(ROOT, "launch_times.jsonl")
+SHUTDOWN_WAIT_S = 2  # Time an idle standby gets to exit on EOF before it is killed
+
+# --- Apps ---
+# `preload` is imported ahead of the click: third-party modules only, so no app state (caches, databases) is opened early
+APPS = {
+    "dreamai": {"name": "DreamAi", "cwd": "DreamAi", "script": "gui.py", "toolkit": "tk",
+                "preload": ["customtkinter", "PIL.Image", "PIL.ImageTk", "requests", "urllib3"]},
+    "diamond": {"name": "Diamond Analyzer", "cwd": "DimonPriceAnalyzer", "script": "main.py", "toolkit": "wx",
+                "preload": ["numpy", "pandas", "matplotlib.pyplot", "matplotlib.backends.backend_wxagg", "seaborn", "wx"]},
+}
+
+
+class WarmPool:
+    """Launcher side: keeps one standby process per app and hands clicks to it.
+
+    Launched and replaced processes are kept until they have exited and been
+    reaped (reap()), so finished apps do not linger as zombies.
+    """
+
+    def __init__(self, warm=True):
+        self.warm = warm
+        self.standby = {}
+        self.launched = []   # Processes handed a click, kept until reap() collects their exit status
+        if warm:
+            for app in APPS:
+                self.replenish(app)
+
+    def _start(self, app):
+        config = APPS[app]
+        return subprocess.Popen([sys.executable, os.path.abspath(__file__), app], stdin=subprocess.PIPE, text=True,
+                                cwd=os.path.join(ROOT, config["cwd"]))
+
+    def reap(self):
+        """Collects the exit status of launched processes that have finished."""
+        self.launched = [proc for proc in self.launched if proc.poll() is None]
+
+    def replenish(self, app):
+        """Starts a standby for `app` unless a live one is already waiting."""
+        self.reap()
+        proc = self.standby.get(app)
+        if self.warm and (proc is None or proc.poll() is not None):
+            self.standby[app] = self._start(app)
+
+    def launch(self, app):
+        """Opens `app` in its standby (or a cold process if none is ready); returns 'warm' or 'cold'."""
+        self.reap()
+        proc = self.standby.pop(app, None)
+        mode = "warm"
+        if proc is None or proc.poll() is not None:
+            proc, mode = self._start(app), "cold"
+        self.launched.append(proc)
+        proc.stdin.write(json.dumps({"click": time.time(), "mode": mode}) + "\n")
+        proc.stdin.close() # The standby exits on EOF if the launcher goes away before a click
+        return mode
+
+    def shutdown(self):
+        """Lets idle standbys exit (they see EOF on stdin) and waits for them; running apps are left open."""
+        for proc in self.standby.values():
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+        for proc in self.standby.values():
+            try:
+                proc.wait(SHUTDOWN_WAIT_S)
+            except subprocess.TimeoutExpired: # Still preloading; nothing of the app has run yet
+                proc.kill()
+                proc.wait()
+        self.standby.clear()
+        self.reap()
+
+
+def read_launch_times(offset=0):
+    """Launch records appended to LAUNCH_LOG after byte `offset`, and the new end offset."""
+    try:
+        with open(LAUNCH_LOG) as f:
+            f.seek(offset)
+            lines = f.readlines()
+            return [json.loads(line) for line in lines if line.endswith("\n")], f.tell()
+    except (OSError, ValueError):
+        return [], offset
+
+
+# --- Standby Process ---
+
+def _log_first_window(app, request, preload_s):
+    record = {"app": app, "mode": request["mode"], "click_to_window_s": round(time.time() - request["click"], 4),
+              "preload_s": round(preload_s, 4), "ts": time.time()}
+    with open(LAUNCH_LOG, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+def _hook_first_window(toolkit, report):
+    """Calls `report()` once the app's event loop is running, i.e. its first window is up."""
+    if toolkit == "wx":
+        import wx
+        main_loop = wx.App.MainLoop
+        def MainLoop(self):
+            wx.CallAfter(report)
+            return main_loop(self)
+        wx.App.MainLoop = MainLoop
+    else:
+        import tkinter
+        mainloop = tkinter.Misc.mainloop
+        def hooked(self, n=0):
+            self.after_idle(report)
+            return mainloop(self, n)
+        tkinter.Misc.mainloop = hooked
+
+def standby(app):
+    config = APPS[app]
+    start = time.perf_counter()
+    for module in config["preload"]:
+        try:
+            importlib.import_module(module)
+        except Exception as e: # The app reports missing dependencies itself
+            print(f"Standby could not preload {module}: {e}")
+    preload_s = time.perf_counter() - start
+
+    line = sys.stdin.readline()
+    if not line:
+        return # Launcher closed without using this standby
+    request = json.loads(line)
+
+    reported = []
+    def report():
+        if not reported:
+            reported.append(True)
+            _log_first_window(app, request, preload_s)
+    _hook_first_window(config["toolkit"], report)
+
+    sys.path.insert(0, os.getcwd())
+    sys.argv = [config["script"]]
+    runpy.run_path(config["script"], run_name="__main__")
+
+
+if __name__ == "__main__":
+    standby(sys.argv[1])